@@ -1,11 +1,13 @@
 DEFAULT_TURNS = 200
 
+import sys
+
 # The order of imports matters!
 from .versions import version
 from . import graph
 from .action import Action
+from .history import History, Interactions, StateDistribution
 from .random_ import random_choice, seed, Pdf
-from .plot import Plot
 from .game import DefaultGame, Game
 from .player import (
     get_state_distribution_from_history, 
@@ -13,8 +15,45 @@ from .player import (
 from .match import Match
 from .strategies import *
 from .match_generator import *
-from .tournament import Tournament
-from .result_set import ResultSet
 from .interaction_utils import *
 
+# Modules depending on matplotlib, pandas, dask or asyncio are only imported
+# when one of their names is first used, so that playing matches does not pay for them.
+_lazy_names = {
+    "Plot": "plot",
+    "Tournament": "tournament",
+    "ResultSet": "result_set",
+    "merge_results": "result_set",
+    "AsyncMatch": "async_match",
+    "AsyncTournament": "async_tournament",
+}
+_lazy_modules = set(_lazy_names.values())
+
+if sys.version_info < (3, 7):  # Module __getattr__ needs PEP 562
+    from .plot import Plot
+    from .tournament import Tournament
+    from .result_set import ResultSet, merge_results
+    from .async_match import AsyncMatch
+    from .async_tournament import AsyncTournament
+
+# Star imports resolve the lazy names through __getattr__
+__all__ = sorted(
+    {name for name in globals() if not name.startswith("_")} - {"sys"} |
+    set(_lazy_names) | _lazy_modules)
+
+
+def __getattr__(name):
+    import importlib
+    if name in _lazy_modules:
+        return importlib.import_module("." + name, __name__)
+    if name in _lazy_names:
+        module = importlib.import_module("." + _lazy_names[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name))
+
 
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_names) | _lazy_modules)
@@ -60,6 +60,21 @@ def str_to_actions(actions: str) -> tuple:
 
 def actions_to_str(actions: Iterable[Action]) -> str:
     """Takes any iterable of Action and returns a string of 'A's
-    and 'B's.  ex: (B, B, A) -> 'BBA' """
+    and 'B's.  ex: (B, B, A) -> 'BBA'
+
+    Compact histories (see `gamesimulator.history`) and their raw buffers of
+    action values are translated directly."""
+    raw = getattr(actions, 'raw', actions)
+    if isinstance(raw, (bytes, bytearray)):
+        return raw.translate(_VALUES_TO_CHARS).decode('ascii')
     return "".join(map(repr, actions))
 
+
+_VALUES_TO_CHARS = bytes.maketrans(b'\x00\x01', b'BA')
+
+
+# The four joint actions of a turn, in the order used for state counts
+# throughout the library. The joint action (x, y) has index
+# 2 * (1 - x.value) + (1 - y.value).
+STATES = ((Action.A, Action.A), (Action.A, Action.B),
+          (Action.B, Action.A), (Action.B, Action.B))
@@ -0,0 +1,77 @@
+"""
+Matches between players whose strategies wait on something outside the
+process, such as a local model server or a subprocess.
+
+A strategy can be a coroutine function, or any function returning an
+awaitable, instead of returning an action:
+
+    class Remote(Player):
+        async def strategy(self, opponent):
+            reply = await ask_server(self.history, opponent.history)
+            return Action.from_char(reply)
+
+`AsyncMatch.play` is a coroutine that awaits such strategies, so that many
+matches can be played on one event loop while they wait. Strategies
+returning actions are called as usual.
+"""
+import asyncio
+import inspect
+
+from gamesimulator.history import MatchRecord
+from gamesimulator.match import Match
+from gamesimulator.player import update_history, update_state_distribution
+
+
+async def async_strategy(player, opponent):
+    """Returns the action of a player, awaiting its strategy if needed."""
+    action = player.strategy(opponent)
+    if inspect.isawaitable(action):
+        action = await action
+    return action
+
+
+class AsyncMatch(Match):
+    """
+    A Match whose `play` is a coroutine awaiting asynchronous strategies
+    (see `gamesimulator.async_match`).
+
+    Matches are always played turn by turn: `fast_forward` is ignored. If a
+    seed is given the global random state is seeded when the match starts,
+    which only makes the match reproducible if no other match uses the random
+    state while it waits.
+    """
+
+    async def play(self):
+        """
+        The resulting list of actions from a match between two players.
+
+        The strategies of both players are awaited together on each turn.
+
+        Returns
+        -------
+        A list of the form:
+
+        e.g. for a 2 turn match between Cooperator and Defector:
+
+            [(A, A), (A, B)]
+
+        i.e. One entry per turn containing a pair of actions.
+        """
+        self._reset_players()
+        player_1, player_2 = self.players
+        accounting = self.match_accounting and player_1 is not player_2
+        if accounting:
+            MatchRecord(player_1, player_2)
+
+        for _ in range(self.turns):
+            s1, s2 = await asyncio.gather(async_strategy(player_1, player_2),
+                                          async_strategy(player_2, player_1))
+            if accounting:
+                player_1.history.append(s1)
+                player_2.history.append(s2)
+            else:
+                update_history(player_1, s1)
+                update_history(player_2, s2)
+                update_state_distribution(player_1, s1, s2)
+                update_state_distribution(player_2, s2, s1)
+        return self._store_result()
@@ -0,0 +1,166 @@
+import asyncio
+
+from .async_match import AsyncMatch
+from .random_ import repetition_seed
+from .result_set import ResultSet
+from .tournament import Tournament, _close_objects
+
+from typing import Optional
+
+
+def run(coroutine):
+    """
+    Runs a coroutine on a new event loop and returns its result, as
+    `asyncio.run` does from Python 3.7, on which it is used.
+    """
+    if hasattr(asyncio, 'run'):
+        return asyncio.run(coroutine)
+    loop = asyncio.new_event_loop()
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(coroutine)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+class AsyncTournament(Tournament):
+    """
+    A Tournament for players with asynchronous strategies (see
+    `gamesimulator.async_match`).
+
+    Matches are played as `AsyncMatch` objects interleaved on one event
+    loop, so that a match waiting on its strategies does not hold up the
+    others. The interactions are written and the results built exactly as by
+    `Tournament.play`.
+    """
+
+    def play(self, build_results: bool = True, filename: str = None,
+             progress_bar: bool = True, file_format: str = 'csv',
+             checkpoint: bool = False, resume: bool = False,
+             concurrency: int = 10) -> Optional[ResultSet]:
+        """
+        Plays the tournament on a new event loop and passes the results to
+        the ResultSet class. Use `play_async` from a running event loop.
+
+        Parameters
+        ----------
+        build_results : bool
+            whether or not to build a results set
+        filename : string
+            name of output file
+        progress_bar : bool
+            Whether or not to create a progress bar which will be updated
+        file_format : string
+            The format of the output file: 'csv' or 'binary'
+        checkpoint : bool
+            Whether or not to record each chunk of matches as it is written
+            (see `Tournament.play`)
+        resume : bool
+            Whether or not to resume from the checkpoint of an earlier run
+            (see `Tournament.play`)
+        concurrency : int
+            The largest number of matches played at the same time
+
+        Returns
+        -------
+        gamesimulator.ResultSet
+        """
+        return run(self.play_async(
+            build_results=build_results, filename=filename,
+            progress_bar=progress_bar, file_format=file_format,
+            checkpoint=checkpoint, resume=resume, concurrency=concurrency))
+
+    async def play_async(self, build_results: bool = True,
+                         filename: str = None, progress_bar: bool = True,
+                         file_format: str = 'csv', checkpoint: bool = False,
+                         resume: bool = False,
+                         concurrency: int = 10) -> Optional[ResultSet]:
+        """A coroutine playing the tournament, with the parameters of
+        `play`."""
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+        self._start_play(build_results=build_results, filename=filename,
+                         progress_bar=progress_bar, file_format=file_format,
+                         checkpoint=checkpoint, resume=resume)
+        await self._run_async(build_results=build_results,
+                              concurrency=concurrency)
+        return self._finish_play(build_results=build_results,
+                                 progress_bar=progress_bar)
+
+    async def _run_async(self, build_results: bool = True,
+                         concurrency: int = 10) -> bool:
+        """
+        Plays all matches on the running event loop, at most `concurrency`
+        at a time, and writes them in the order of their chunks.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def play_chunk(chunk):
+            async with semaphore:
+                return await self._play_matches_async(chunk, build_results)
+
+        chunks = list(self._remaining_chunks())
+        tasks = [asyncio.ensure_future(play_chunk(chunk))
+                 for _, chunk in chunks]
+
+        out_file, writer = self._get_file_objects(build_results)
+        progress_bar = self._get_progress_bar()
+        try:
+            for (chunk_index, _), task in zip(chunks, tasks):
+                results = await task
+                self._write_interactions_to_file(results, writer=writer)
+                self._record_chunk(chunk_index, out_file, writer)
+
+                if self.use_progress_bar:
+                    progress_bar.update(1)
+        finally:
+            for task in tasks:
+                task.cancel()
+            _close_objects(writer, out_file, progress_bar)
+        return True
+
+    async def _play_matches_async(self, chunk, build_results=True):
+        """
+        Plays the matches in a given chunk, as `Tournament._play_matches`
+        does.
+        """
+        index_pair = chunk[0]
+        key = self._cache_key(index_pair)
+        match_results = None
+        if key is not None:
+            match_results = self.match_cache.get(key)
+        if match_results is None:
+            match_results = await self._play_match_results_async(chunk)
+            if key is not None:
+                self.match_cache.set(key, match_results)
+
+        return self._analyse_match_results(index_pair, match_results,
+                                           build_results)
+
+    async def _play_match_results_async(self, chunk):
+        """
+        Plays the repetitions of the match in a given chunk.
+
+        With a seed, the global random state is seeded at the start of each
+        repetition (see `Tournament`). As other matches may draw from it while
+        a match waits, runs are only reproducible with a concurrency of 1.
+
+        Returns
+        -------
+        A list with the interactions of each repetition.
+        """
+        index_pair, match_params, repetitions = chunk
+        p1_index, p2_index = index_pair
+        player1 = self.players[p1_index].clone()
+        player2 = self.players[p2_index].clone()
+        match_params["players"] = (player1, player2)
+        match = AsyncMatch(**match_params)
+
+        match_results = []
+        for repetition in range(repetitions):
+            if self.seed is not None:
+                match.seed = repetition_seed(self.seed, p1_index, p2_index,
+                                             repetition)
+            match_results.append(await match.play())
+        return match_results
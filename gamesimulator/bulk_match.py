@@ -0,0 +1,140 @@
+"""
+Plays many matches between memory-one strategies at once.
+
+A strategy that can describe itself through `Player.memory_one_table` only
+needs the previous joint action to choose its next action. Every pairing and
+repetition of such strategies can then be advanced a turn at a time as NumPy
+arrays instead of through `Match.play`.
+
+Actions are coded as their `Action` value: 1 for A and 0 for B.
+"""
+import numpy as np
+
+from gamesimulator.action import Action
+from gamesimulator.history import Interactions
+from gamesimulator.random_ import repetition_generator
+
+
+A, B = Action.A, Action.B
+
+# The number of turns of random numbers drawn at once from the generator of
+# each repetition in a seeded run.
+DRAW_BLOCK = 64
+
+
+def memory_one_tables(players):
+    """
+    Returns the memory-one tables of a list of players.
+
+    Parameters
+    ----------
+    players : list
+        A list of gamesimulator.Player objects
+
+    Returns
+    -------
+    A dictionary mapping the index of each player that has a table to a tuple
+    (first, responses) of a float and an array of length 4.
+    """
+    tables = {}
+    for index, player in enumerate(players):
+        table = player.memory_one_table()
+        if table is not None:
+            first, responses = table
+            tables[index] = (float(first),
+                             np.array(responses, dtype=float))
+    return tables
+
+
+def play_memory_one_matches(tables, index_pairs, turns, repetitions,
+                            seed=None):
+    """
+    Plays all repetitions of the matches between the given pairs of players.
+
+    Parameters
+    ----------
+    tables : dict
+        Mapping player indices to memory-one tables as returned by
+        `memory_one_tables`
+    index_pairs : list
+        A list of (player index, opponent index) tuples
+    turns : integer
+        The number of turns per match
+    repetitions : integer
+        The number of repetitions of each match
+    seed : int
+        If given, every repetition of every match draws its random numbers
+        from its own generator (see `gamesimulator.random_.repetition_generator`)
+        so that its actions do not depend on the other matches played at the
+        same time. Otherwise the global `numpy.random` state is used.
+
+    Returns
+    -------
+    A dictionary mapping each index pair to a tuple of two arrays of shape
+    (repetitions, turns) holding the actions of the first and second player.
+    """
+    index_pairs = list(index_pairs)
+    if not index_pairs:
+        return {}
+
+    indices = sorted(tables)
+    position = {index: i for i, index in enumerate(indices)}
+    first = np.array([tables[index][0] for index in indices])
+    responses = np.array([tables[index][1] for index in indices])
+    stochastic = bool(np.any((first > 0) & (first < 1)) or
+                      np.any((responses > 0) & (responses < 1)))
+
+    # One simulation per (pair, repetition), pairs varying slowest.
+    rows_1 = np.repeat([position[i] for i, _ in index_pairs], repetitions)
+    rows_2 = np.repeat([position[j] for _, j in index_pairs], repetitions)
+    size = len(rows_1)
+
+    actions_1 = np.empty((size, turns), dtype=np.uint8)
+    actions_2 = np.empty((size, turns), dtype=np.uint8)
+
+    generators = []  # type: list
+    if stochastic and seed is not None:
+        generators = [repetition_generator(seed, i, j, repetition)
+                      for i, j in index_pairs
+                      for repetition in range(repetitions)]
+
+    probabilities_1 = first[rows_1]
+    probabilities_2 = first[rows_2]
+    for turn in range(turns):
+        if generators:
+            if turn % DRAW_BLOCK == 0:
+                block = min(DRAW_BLOCK, turns - turn)
+                # Shape (2, block, size): the stream of each generator holds
+                # the draws of both players turn after turn.
+                block_draws = np.stack(
+                    [generator.random((block, 2))
+                     for generator in generators], axis=2).transpose(1, 0, 2)
+            draws = block_draws[:, turn % DRAW_BLOCK]
+        elif stochastic:
+            draws = np.random.random_sample((2, size))
+        else:
+            draws = np.zeros((2, size))
+        move_1 = (draws[0] < probabilities_1).astype(np.intp)
+        move_2 = (draws[1] < probabilities_2).astype(np.intp)
+        actions_1[:, turn] = move_1
+        actions_2[:, turn] = move_2
+
+        # State indices follow the order of `gamesimulator.action.STATES`
+        state_1 = 2 * (1 - move_1) + (1 - move_2)
+        state_2 = 2 * (1 - move_2) + (1 - move_1)
+        probabilities_1 = responses[rows_1, state_1]
+        probabilities_2 = responses[rows_2, state_2]
+
+    shape = (len(index_pairs), repetitions, turns)
+    actions_1 = actions_1.reshape(shape)
+    actions_2 = actions_2.reshape(shape)
+    return {index_pair: (actions_1[i], actions_2[i])
+            for i, index_pair in enumerate(index_pairs)}
+
+
+def actions_to_interactions(actions_1, actions_2):
+    """
+    Converts two arrays of coded actions to a
+    `gamesimulator.history.Interactions` object.
+    """
+    return Interactions(actions_1.tobytes(), actions_2.tobytes())
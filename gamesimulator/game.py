@@ -1,3 +1,5 @@
+import numpy as np
+
 from .action import Action
 from typing import Tuple, Union
 
@@ -16,6 +18,9 @@ class Game(object):
             (A, B): (s, t),
             (B, A): (t, s),
         }
+        # The scores of both players for each joint action, in the order of
+        # `gamesimulator.action.STATES`.
+        self.payoff_array = np.array([[r, r], [s, t], [t, s], [p, p]])
 
     def RPST(self) -> Tuple[Score, Score, Score, Score]:
         """Return the values in the game matrix in the Press and Dyson
@@ -0,0 +1,237 @@
+"""
+Compact storage for the actions played in a match.
+
+Actions are stored by their `Action` value, 1 for A and 0 for B, one byte per
+turn. The classes here behave like the lists of actions and of pairs of
+actions used elsewhere in the library, so strategies need not know which
+storage is in use, while the raw buffers are available through `raw` for
+code that can work on them directly.
+"""
+from collections.abc import MutableMapping, Sequence
+
+from gamesimulator.action import Action, STATES
+
+
+A, B = Action.A, Action.B
+
+DECODE = (B, A)
+
+STATE_INDEX = {state: index for index, state in enumerate(STATES)}
+
+
+class History(Sequence):
+    """The actions of a single player, stored in a bytearray."""
+
+    __slots__ = ('raw',)
+
+    def __init__(self, actions=()):
+        self.raw = bytearray()
+        self.extend(actions)
+
+    def append(self, action):
+        self.raw.append(action.value)
+
+    def extend(self, actions):
+        if isinstance(actions, History):
+            self.raw.extend(actions.raw)
+        else:
+            self.raw.extend(action.value for action in actions)
+
+    def count(self, action):
+        return self.raw.count(action.value)
+
+    def copy(self):
+        history = History()
+        history.raw = bytearray(self.raw)
+        return history
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [DECODE[value] for value in self.raw[key]]
+        return DECODE[self.raw[key]]
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __iter__(self):
+        return map(DECODE.__getitem__, self.raw)
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __eq__(self, other):
+        if isinstance(other, History):
+            return self.raw == other.raw
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class Interactions(Sequence):
+    """
+    The interactions of a match stored as the raw histories of both players.
+    Behaves like a list of the form:
+
+        [(A, B), (B, A),...]
+    """
+
+    __slots__ = ('raw',)
+
+    def __init__(self, raw_1, raw_2):
+        self.raw = (raw_1, raw_2)
+
+    def __getitem__(self, key):
+        raw_1, raw_2 = self.raw
+        if isinstance(key, slice):
+            return list(zip(map(DECODE.__getitem__, raw_1[key]),
+                            map(DECODE.__getitem__, raw_2[key])))
+        return DECODE[raw_1[key]], DECODE[raw_2[key]]
+
+    def __len__(self):
+        return len(self.raw[0])
+
+    def __iter__(self):
+        raw_1, raw_2 = self.raw
+        return zip(map(DECODE.__getitem__, raw_1),
+                   map(DECODE.__getitem__, raw_2))
+
+    def __eq__(self, other):
+        if isinstance(other, Interactions):
+            return (bytes(self.raw[0]) == bytes(other.raw[0]) and
+                    bytes(self.raw[1]) == bytes(other.raw[1]))
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class StateDistribution(MutableMapping):
+    """
+    Counts of the joint actions (action, reply) of a player, stored in four
+    slots in the order of `gamesimulator.action.STATES`. Behaves like the
+    dictionary of counts keyed by joint action used elsewhere in the library:
+    missing states count 0 and only states that occurred are listed.
+    """
+
+    __slots__ = ('counts',)
+
+    def __init__(self, counts=None):
+        self.counts = [0, 0, 0, 0]
+        if counts is not None:
+            self.update(counts)
+
+    def __getitem__(self, state):
+        return self.counts[STATE_INDEX[state]]
+
+    def __setitem__(self, state, count):
+        self.counts[STATE_INDEX[state]] = count
+
+    def __delitem__(self, state):
+        self.counts[STATE_INDEX[state]] = 0
+
+    def __iter__(self):
+        return (state for state, count in zip(STATES, self.counts) if count)
+
+    def __len__(self):
+        return sum(1 for count in self.counts if count)
+
+    def __contains__(self, state):
+        return state in STATE_INDEX and self[state] != 0
+
+    def copy(self):
+        return StateDistribution(dict(self))
+
+    def __eq__(self, other):
+        if isinstance(other, StateDistribution):
+            return self.counts == other.counts
+        if isinstance(other, dict):
+            return dict(self) == {state: count
+                                  for state, count in other.items() if count}
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class MatchRecord(object):
+    """
+    The canonical record of the joint actions of a match, shared by both
+    players when a `gamesimulator.Match` is played with `match_accounting`.
+
+    Only the histories of the players are written as the match is played.
+    The action counts and state distribution of each player are derived from
+    them when they are read, counting only the turns played since the
+    previous read.
+    """
+
+    __slots__ = ('players', 'counted', 'counts')
+
+    def __init__(self, player_1, player_2):
+        self.players = (player_1, player_2)
+        self.counted = 0
+        self.counts = [0, 0, 0, 0]
+        player_1._record, player_1._side = self, 0
+        player_2._record, player_2._side = self, 1
+
+    def _update(self):
+        history_1, history_2 = (player.history for player in self.players)
+        turns = min(len(history_1), len(history_2))
+        if turns == self.counted:
+            return
+        counts = self.counts
+        for state in zip(history_1[self.counted:turns],
+                         history_2[self.counted:turns]):
+            counts[STATE_INDEX[state]] += 1
+        self.counted = turns
+
+    def state_counts(self, side):
+        """
+        The counts of each state, in the order of
+        `gamesimulator.action.STATES`, from the point of view of the player on
+        the given side (0 or 1) of the match.
+        """
+        self._update()
+        counts = self.counts
+        if side == 0:
+            return list(counts)
+        return [counts[0], counts[2], counts[1], counts[3]]
+
+    def action_count(self, side, action):
+        """The number of times the player on the given side played an
+        action."""
+        aa, ab, ba, bb = self.state_counts(side)
+        if action == A:
+            return aa + ab
+        return ba + bb
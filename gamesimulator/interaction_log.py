@@ -0,0 +1,385 @@
+"""
+A binary alternative to the CSV file of interactions written by a Tournament.
+
+The file is a sequence of NumPy ``.npy`` arrays. The first holds the names of
+the players. It is followed by blocks of three arrays:
+
+* the range of the pairs of players in the block, a 2 x 2 array of the first
+  and last (lower index, higher index) pair in lexicographic order, so that
+  the blocks holding a pair are found without reading the records,
+* a record array with one fixed-width row per interaction and player, with
+  the columns of `RECORD_DTYPE` (and of `RESULT_DTYPE` if results were
+  built),
+* the actions of those rows, one bit per turn (1 for A, 0 for B), with every
+  row starting on a new byte at its `actions_offset`.
+
+Blocks are written as the tournament progresses, so a file can be appended
+to and read back block by block. `InteractionLogReader` memory-maps the blocks
+to read single interactions without loading the file. Blocks without a range
+array, written before it was added, are still read.
+"""
+import csv
+import os
+
+import numpy as np
+
+from .history import Interactions
+
+
+MAGIC = b'\x93NUMPY'
+
+RECORD_DTYPE = [('interaction_index', '<i8'),
+                ('player_index', '<i4'),
+                ('opponent_index', '<i4'),
+                ('repetition', '<i4'),
+                ('turns', '<i4'),
+                ('actions_offset', '<i8')]
+
+RESULT_DTYPE = [('score', '<f8'),
+                ('score_difference', '<f8'),
+                ('score_per_turn', '<f8'),
+                ('score_difference_per_turn', '<f8'),
+                ('win', '<i1'),
+                ('state_counts', '<i4', (4,)),
+                ('state_to_action_counts', '<i4', (8,))]
+
+
+def is_interaction_log(filename):
+    """Whether or not `filename` is a binary interaction log rather than a
+    CSV file."""
+    with open(filename, 'rb') as file_obj:
+        return file_obj.read(len(MAGIC)) == MAGIC
+
+
+class InteractionLogWriter(object):
+    """
+    Writes the rows produced by a Tournament to a binary interaction log.
+
+    Rows are the same lists that are written to CSV. They are buffered and
+    written as a block when `block_size` rows have accumulated or when
+    `flush` is called.
+    """
+
+    def __init__(self, file_obj, players, build_results=True,
+                 block_size=10000):
+        """
+        Parameters
+        ----------
+            file_obj : file
+                A file opened in binary mode
+            players : list
+                The names of the players
+            build_results : bool
+                Whether or not rows include results
+            block_size : int
+                The number of rows to buffer before writing a block
+        """
+        self.file = file_obj
+        self.build_results = build_results
+        dtype = RECORD_DTYPE
+        if build_results:
+            dtype = dtype + RESULT_DTYPE
+        self.dtype = np.dtype(dtype)
+        self.block_size = block_size
+        self._records = []  # type: list
+        self._actions = []  # type: list
+        self._offset = 0
+        if file_obj.tell() == 0:
+            np.save(file_obj, np.array(players, dtype=str))
+
+    def writerow(self, row):
+        """Buffers a row of the form written to CSV."""
+        history = row[6]
+        actions = np.frombuffer(history.encode('ascii'), dtype=np.uint8)
+        packed = np.packbits(actions == ord('A')).tobytes()
+
+        record = (row[0], row[1], row[2], row[3], len(history), self._offset)
+        if self.build_results:
+            score, score_diff, _, score_per_turn, score_diff_per_turn, win = \
+                row[7:13]
+            record += (score, score_diff, score_per_turn, score_diff_per_turn,
+                       win, row[13:17], row[17:25])
+        self._records.append(record)
+        self._actions.append(packed)
+        self._offset += len(packed)
+
+        if len(self._records) >= self.block_size:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered rows as a block."""
+        if self._records:
+            records = np.array(self._records, dtype=self.dtype)
+            actions = np.frombuffer(b''.join(self._actions), dtype=np.uint8)
+            pairs = [(min(record[1], record[2]), max(record[1], record[2]))
+                     for record in self._records]
+            np.save(self.file, np.array([min(pairs), max(pairs)],
+                                        dtype='<i4'))
+            np.save(self.file, records)
+            np.save(self.file, actions)
+            self._records, self._actions, self._offset = [], [], 0
+        self.file.flush()
+
+    def close(self):
+        """Writes any buffered rows. The file itself is left open."""
+        self.flush()
+
+
+def read_players(filename):
+    """Returns the list of player names stored in a binary interaction log."""
+    with open(filename, 'rb') as file_obj:
+        return np.load(file_obj).tolist()
+
+
+def read_blocks(filename):
+    """
+    A generator of the blocks of a binary interaction log.
+
+    Yields
+    ------
+    tuples
+        (record array, array of packed actions)
+    """
+    with open(filename, 'rb') as file_obj:
+        size = os.fstat(file_obj.fileno()).st_size
+        np.load(file_obj)  # The player names
+        while file_obj.tell() < size:
+            records = np.load(file_obj)
+            if records.dtype.names is None:  # The range of pairs
+                records = np.load(file_obj)
+            actions = np.load(file_obj)
+            yield records, actions
+
+
+CSV_RESULT_COLUMNS = {'score': 'Score',
+                      'score_difference': 'Score difference',
+                      'score_per_turn': 'Score per turn',
+                      'score_difference_per_turn': 'Score difference per turn',
+                      'win': 'Win'}
+
+CSV_STATE_COLUMNS = ['AA count', 'AB count', 'BA count', 'BB count']
+
+CSV_STATE_TO_ACTION_COLUMNS = ['AA to A count', 'AA to B count',
+                               'AB to A count', 'AB to B count',
+                               'BA to A count', 'BA to B count',
+                               'BB to A count', 'BB to B count']
+
+
+def read_csv_blocks(filename, block_size=100000):
+    """
+    A generator of the rows of a CSV file written by a Tournament with
+    results, as record arrays with the columns of `RECORD_DTYPE` and
+    `RESULT_DTYPE`. The actions are not read: the `actions_offset` column is
+    0.
+
+    Yields
+    ------
+    numpy.array
+        A record array of at most `block_size` rows
+    """
+    with open(filename, 'r', newline='') as file_obj:
+        reader = csv.reader(file_obj)
+        header = next(reader)
+        if 'Score' not in header:
+            raise ValueError("{} does not contain results.".format(filename))
+        rows = []  # type: list
+        for row in reader:
+            rows.append(row)
+            if len(rows) == block_size:
+                yield _csv_rows_to_records(rows, header)
+                rows = []
+        if rows:
+            yield _csv_rows_to_records(rows, header)
+
+
+def read_score_dtype(filename):
+    """
+    Returns the type of the scores in a CSV file or binary interaction log:
+    integers if the scores of a CSV file are written as integers, as they are
+    for games with integer payoffs, otherwise floats.
+    """
+    if is_interaction_log(filename):
+        return np.dtype(float)
+    with open(filename, 'r', newline='') as file_obj:
+        reader = csv.reader(file_obj)
+        header = next(reader)
+        row = next(reader, None)
+    if row is None or 'Score' not in header:
+        return np.dtype(float)
+    try:
+        int(row[header.index('Score')])
+    except ValueError:
+        return np.dtype(float)
+    return np.dtype(np.int64)
+
+
+def _csv_rows_to_records(rows, header):
+    columns = dict(zip(header, zip(*rows)))
+    records = np.zeros(len(rows), dtype=RECORD_DTYPE + RESULT_DTYPE)
+    records['interaction_index'] = np.array(columns['Interaction index'])
+    records['player_index'] = np.array(columns['Player index'])
+    records['opponent_index'] = np.array(columns['Opponent index'])
+    records['repetition'] = np.array(columns['Repetition'])
+    records['turns'] = np.array(columns['Turns'])
+    for field, column in CSV_RESULT_COLUMNS.items():
+        # Floats are parsed exactly from their shortest representation
+        records[field] = np.array(columns[column]).astype(records.dtype[field])
+    records['state_counts'] = np.array(
+        [columns[column] for column in CSV_STATE_COLUMNS]).T
+    # Files written before these columns existed leave the counts at 0
+    if all(column in columns for column in CSV_STATE_TO_ACTION_COLUMNS):
+        records['state_to_action_counts'] = np.array(
+            [columns[column] for column in CSV_STATE_TO_ACTION_COLUMNS]).T
+    return records
+
+
+def unpack_actions(actions, offset, turns):
+    """
+    Returns the actions of a row as an array of action values, 1 for A and 0
+    for B.
+    """
+    end = offset + (turns + 7) // 8
+    return np.unpackbits(actions[offset:end])[:turns]
+
+
+def _read_array_location(file_obj):
+    """
+    Reads the header of the .npy array at the current position of `file_obj`
+    and moves past the array.
+
+    Returns
+    -------
+    tuple
+        (offset of the data, shape, dtype)
+    """
+    version = np.lib.format.read_magic(file_obj)
+    if version == (1, 0):
+        header = np.lib.format.read_array_header_1_0(file_obj)
+    elif version == (2, 0):
+        header = np.lib.format.read_array_header_2_0(file_obj)
+    else:
+        raise ValueError("Unsupported .npy version {}".format(version))
+    shape, _, dtype = header
+    offset = file_obj.tell()
+    file_obj.seek(offset + int(np.prod(shape)) * dtype.itemsize)
+    return offset, shape, dtype
+
+
+class InteractionLogReader(object):
+    """
+    Reads single interactions from a binary interaction log without loading
+    it.
+
+    On creation only the headers of the blocks and the ranges of pairs they
+    hold are read. Interactions are then read from the memory-mapped blocks
+    whose range holds the pair requested. The player and opponent columns of
+    blocks written without a range are scanned instead.
+    """
+
+    def __init__(self, filename):
+        """
+        Parameters
+        ----------
+            filename : string
+                A binary interaction log
+        """
+        if not is_interaction_log(filename):
+            raise ValueError(
+                "{} is not a binary interaction log.".format(filename))
+        self.filename = filename
+        self.players = read_players(filename)
+        self.blocks = []  # type: list
+        self.ranges = []  # type: list
+
+        with open(filename, 'rb') as file_obj:
+            size = os.fstat(file_obj.fileno()).st_size
+            _read_array_location(file_obj)  # The player names
+            while file_obj.tell() < size:
+                location = _read_array_location(file_obj)
+                pair_range = None
+                if location[2].names is None:  # The range of pairs
+                    file_obj.seek(location[0])
+                    pair_range = [tuple(pair) for pair in np.fromfile(
+                        file_obj, dtype=location[2],
+                        count=4).reshape(2, 2).tolist()]
+                    location = _read_array_location(file_obj)
+                actions = _read_array_location(file_obj)
+                self.blocks.append((location, actions))
+                self.ranges.append(pair_range)
+
+        for block_index, pair_range in enumerate(self.ranges):
+            if pair_range is None:
+                records = self._records(block_index)
+                pairs = np.stack(
+                    [np.minimum(records['player_index'],
+                                records['opponent_index']),
+                     np.maximum(records['player_index'],
+                                records['opponent_index'])], axis=1)
+                pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+                self.ranges[block_index] = [tuple(pairs[0].tolist()),
+                                            tuple(pairs[-1].tolist())]
+
+    def _block_indices(self, player_index, opponent_index):
+        """The indices of the blocks whose range holds a pair of players."""
+        pair = (min(player_index, opponent_index),
+                max(player_index, opponent_index))
+        return [block_index
+                for block_index, (first, last) in enumerate(self.ranges)
+                if first <= pair <= last]
+
+    def _records(self, block_index):
+        offset, shape, dtype = self.blocks[block_index][0]
+        return np.memmap(self.filename, dtype=dtype, mode='r', offset=offset,
+                         shape=shape)
+
+    def _actions(self, block_index):
+        offset, shape, dtype = self.blocks[block_index][1]
+        return np.memmap(self.filename, dtype=dtype, mode='r', offset=offset,
+                         shape=shape)
+
+    def records(self, player_index, opponent_index):
+        """
+        Returns the records of every interaction between two players, from
+        the point of view of the player.
+        """
+        found = []
+        for block_index in self._block_indices(player_index, opponent_index):
+            records = self._records(block_index)
+            mask = ((records['player_index'] == player_index) &
+                    (records['opponent_index'] == opponent_index))
+            found.append(np.array(records[mask]))
+        if not found:
+            return np.array([], dtype=self.blocks[0][0][2]
+                            if self.blocks else RECORD_DTYPE)
+        return np.concatenate(found)
+
+    def interactions(self, player_index, opponent_index, repetition):
+        """
+        Returns the interactions of a given repetition of the match between
+        two players, from the point of view of the player, as a
+        `gamesimulator.history.Interactions` object.
+
+        Raises a KeyError if the match is not in the file.
+        """
+        for block_index in self._block_indices(player_index, opponent_index):
+            records = self._records(block_index)
+            rows = np.flatnonzero(
+                (records['player_index'] == player_index) &
+                (records['opponent_index'] == opponent_index) &
+                (records['repetition'] == repetition))
+            if len(rows) == 0:
+                continue
+            row = rows[0]
+            interaction_index = records['interaction_index'][row]
+            rows = np.flatnonzero(
+                records['interaction_index'] == interaction_index)
+            # A player meeting itself has two identical keys, the first row
+            # is that of the first player.
+            opponent_row = rows[rows != row][0]
+            actions = self._actions(block_index)
+            histories = [bytes(unpack_actions(actions,
+                                              records['actions_offset'][i],
+                                              records['turns'][i]))
+                         for i in (row, opponent_row)]
+            return Interactions(*histories)
+        raise KeyError((player_index, opponent_index, repetition))
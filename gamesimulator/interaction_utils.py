@@ -4,20 +4,35 @@ form:
 
     [(A, B), (B, A),...]
 
+or `gamesimulator.history.Interactions` objects which behave like them.
+
 This is used by both the Match class and the ResultSet class which analyse
 interactions.
 """
 from collections import Counter, defaultdict
 import csv
-import tqdm
-import pandas as pd
+import numpy as np
 
-from gamesimulator.action import Action, str_to_actions
+from gamesimulator.action import Action, STATES, str_to_actions
 from .game import Game
+from .history import DECODE, Interactions
+from .interaction_log import is_interaction_log, read_blocks, unpack_actions
 
 
 A, B = Action.A, Action.B
 
+# The bins of the state to action counts: a state, seen from the point of view
+# of a player, followed by the player's next action
+STATE_TO_ACTIONS = tuple((state, action) for state in STATES
+                         for action in (A, B))
+
+# The index of each state seen from the point of view of the second player
+SWAPPED_STATES = np.array([0, 2, 1, 3], dtype=np.uint8)
+
+# Reorders the state to action counts of the second player between its own
+# point of view and that of the first player
+SWAPPED_STATE_TO_ACTIONS = np.array([0, 1, 4, 5, 2, 3, 6, 7])
+
 
 def compute_scores(interactions, game=None):
     """Returns the scores of a given set of interactions."""
@@ -26,40 +41,104 @@ def compute_scores(interactions, game=None):
     return [game.score(plays) for plays in interactions]
 
 
+def interactions_to_states(interactions):
+    """
+    Returns an array with the index in `gamesimulator.action.STATES` of the
+    joint action of each turn of a set of interactions.
+    """
+    if isinstance(interactions, Interactions):
+        actions_1, actions_2 = (np.frombuffer(raw, dtype=np.uint8)
+                                for raw in interactions.raw)
+        return 3 - 2 * actions_1 - actions_2
+    indices = {state: index for index, state in enumerate(STATES)}
+    return np.fromiter((indices[state] for state in interactions),
+                       dtype=np.uint8, count=len(interactions))
+
+
+def compute_state_to_action_counts(states):
+    """
+    Returns the number of times each player moves from each state to each
+    action, as an array of shape (2, 8) whose rows are the counts of the
+    first and second player in the order of `STATE_TO_ACTIONS`, states being
+    seen from the point of view of each player.
+
+    Parameters
+    ----------
+    states : numpy.array
+        The index of the joint action of every turn, as returned by
+        `interactions_to_states`
+    """
+    states = np.asarray(states, dtype=np.uint8)
+    previous, following = states[:-1], states[1:]
+    # The first bit of a state is the action of the first player (0 for A)
+    # and the second bit that of the second player
+    codes_1 = 2 * previous + (following >> 1)
+    codes_2 = 2 * SWAPPED_STATES[previous] + (following & 1)
+    return np.stack([np.bincount(codes_1, minlength=8),
+                     np.bincount(codes_2, minlength=8)])
+
+
+def compute_interaction_summary(states, game=None):
+    """
+    Scores a set of interactions in a single pass.
+
+    Parameters
+    ----------
+    states : numpy.array
+        The index of the joint action of every turn, as returned by
+        `interactions_to_states`
+    game : gamesimulator.Game
+        The game used to score the interactions
+
+    Returns
+    -------
+    final_score : tuple
+        The total score of each player, None if there are no turns
+    final_score_per_turn : tuple
+        The mean score per turn of each player, None if there are no turns
+    state_counts : numpy.array
+        The number of times each joint action in `STATES` occurs
+    winner_index : int
+        The index of the winner, False if there is no winner and None if
+        there are no turns
+    state_to_action_counts : numpy.array
+        The number of times each player moves from each state to each action,
+        as returned by `compute_state_to_action_counts`
+    """
+    if not game:
+        game = Game()
+    state_counts = np.bincount(states, minlength=4)
+    state_to_action_counts = compute_state_to_action_counts(states)
+    turns = len(states)
+    if turns == 0:
+        return None, None, state_counts, None, state_to_action_counts
+
+    final_score = tuple(state_counts.dot(game.payoff_array).tolist())
+    final_score_per_turn = tuple(score / turns for score in final_score)
+    if final_score[0] == final_score[1]:
+        winner_index = False  # No winner
+    else:
+        winner_index = int(final_score[1] > final_score[0])
+    return (final_score, final_score_per_turn, state_counts, winner_index,
+            state_to_action_counts)
+
+
 def compute_final_score(interactions, game=None):
     """Returns the final score of a given set of interactions."""
-    scores = compute_scores(interactions, game)
-    if len(scores) == 0:
-        return None
-
-    final_score = tuple(sum([score[player_index] for score in scores])
-                        for player_index in [0, 1])
-    return final_score
+    states = interactions_to_states(interactions)
+    return compute_interaction_summary(states, game)[0]
 
 
 def compute_final_score_per_turn(interactions, game=None):
     """Returns the mean score per round for a set of interactions"""
-    scores = compute_scores(interactions, game)
-    num_turns = len(interactions)
-
-    if len(scores) == 0:
-        return None
-
-    final_score_per_turn = tuple(
-        sum([score[player_index] for score in scores]) / num_turns
-        for player_index in [0, 1])
-    return final_score_per_turn
+    states = interactions_to_states(interactions)
+    return compute_interaction_summary(states, game)[1]
 
 
 def compute_winner_index(interactions, game=None):
     """Returns the index of the winner of the Match"""
-    scores = compute_final_score(interactions, game)
-
-    if scores is not None:
-        if scores[0] == scores[1]:
-            return False  # No winner
-        return max([0, 1], key=lambda i: scores[i])
-    return None
+    states = interactions_to_states(interactions)
+    return compute_interaction_summary(states, game)[3]
 
 def compute_state_distribution(interactions):
     """
@@ -79,6 +158,10 @@ def compute_state_distribution(interactions):
     """
     if not interactions:
         return None
+    if isinstance(interactions, Interactions):
+        counts = Counter(zip(*interactions.raw))
+        return Counter({(DECODE[x], DECODE[y]): count
+                        for (x, y), count in counts.items()})
     return Counter(interactions)
 
 
@@ -101,7 +184,7 @@ def compute_normalised_state_distribution(interactions):
     if not interactions:
         return None
 
-    interactions_count = Counter(interactions)
+    interactions_count = compute_state_distribution(interactions)
     total = sum(interactions_count.values(), 0)
 
     normalized_count = Counter({key: value / total for key, value in
@@ -109,98 +192,113 @@ def compute_normalised_state_distribution(interactions):
     return normalized_count
 
 
-# def compute_state_to_action_distribution(interactions):
-#     """
-#     Returns a list (for each player) of counts of each state to action pair
-#     for a set of interactions. A state to action pair is of the form:
-# 
-#     ((A, B), A)
-# 
-#     Implying that from a state of (A, B) (the first player having played A and
-#     the second playing B) the player in question then played A.
-# 
-#     The following counter object implies that the player in question was in
-#     state (A, B) for a total of 12 times, subsequently cooperating 4 times and
-#     defecting 8 times.
-# 
-#     Counter({((A, B), A): 4, ((A, B), B): 8})
-# 
-#     Parameters
-#     ----------
-#     interactions : list of tuples
-#         A list containing the interactions of the match as shown at the top of
-#         this file.
-# 
-#     Returns
-#     ----------
-#     state_to_C_distributions : List of Counter Object
-#         List of Counter objects where the keys are the states and actions and
-#         the values the counts. The
-#         first/second Counter corresponds to the first/second player.
-#     """
-#     if not interactions:
-#         return None
-# 
-#     distributions = [Counter([(state, outcome[j])
-#                      for state, outcome in zip(interactions, interactions[1:])])
-#                      for j in range(2)]
-#     return distributions
-
-
-# def compute_normalised_state_to_action_distribution(interactions):
-#     """
-#     Returns a list (for each player) of normalised counts of each state to action
-#     pair for a set of interactions. A state to action pair is of the form:
-# 
-#     ((A, B), A)
-# 
-#     implying that from a state of (A, B) (the first player having played A and
-#     the second playing B) the player in question then played A.
-# 
-#     The following counter object, implies that the player in question was only
-#     ever in state (A, B), subsequently cooperating 1/3 of the time and defecting
-#     2/3 times.
-# 
-#     Counter({((A, B), A): 0.333333, ((A, B), B): 0.66666667})
-# 
-#     Parameters
-#     ----------
-#     interactions : list of tuples
-#         A list containing the interactions of the match as shown at the top of
-#         this file.
-# 
-#     Returns
-#     -------
-#     normalised_state_to_A_distributions : List of Counter Object
-#         List of Counter objects where the keys are the states and actions and
-#         the values the normalized counts. The first/second Counter corresponds
-#         to the first/second player.
-#     """
-#     if not interactions:
-#         return None
-# 
-#     distribution = compute_state_to_action_distribution(interactions)
-#     normalized_distribution = []
-#     for player in range(2):
-#         counter = {}
-#         for state in [(A, A), (A, B), (B, A), (B, B)]:
-#             A_count = distribution[player].get((state, A), 0)
-#             B_count = distribution[player].get((state, B), 0)
-#             total = A_count + B_count
-#             if total > 0:
-#                 if A_count > 0:
-#                     counter[(state, A)] = A_count / (A_count + B_count)
-#                 if B_count > 0:
-#                     counter[(state, B)] = B_count / (A_count + B_count)
-#         normalized_distribution.append(Counter(counter))
-#     return normalized_distribution
+def compute_state_to_action_distribution(interactions):
+    """
+    Returns a list (for each player) of counts of each state to action pair
+    for a set of interactions. A state to action pair is of the form:
+
+    ((A, B), A)
+
+    Implying that from a state of (A, B) (the first player having played A and
+    the second playing B) the player in question then played A.
+
+    The following counter object implies that the player in question was in
+    state (A, B) for a total of 12 times, subsequently cooperating 4 times and
+    defecting 8 times.
+
+    Counter({((A, B), A): 4, ((A, B), B): 8})
+
+    Parameters
+    ----------
+    interactions : list of tuples
+        A list containing the interactions of the match as shown at the top of
+        this file.
+
+    Returns
+    ----------
+    state_to_C_distributions : List of Counter Object
+        List of Counter objects where the keys are the states and actions and
+        the values the counts. The
+        first/second Counter corresponds to the first/second player.
+    """
+    if not interactions:
+        return None
+
+    counts = compute_state_to_action_counts(
+        interactions_to_states(interactions))
+    counts[1] = counts[1][SWAPPED_STATE_TO_ACTIONS]
+    return [Counter({key: count for key, count
+                     in zip(STATE_TO_ACTIONS, player_counts.tolist())
+                     if count > 0})
+            for player_counts in counts]
+
+
+def compute_normalised_state_to_action_distribution(interactions):
+    """
+    Returns a list (for each player) of normalised counts of each state to action
+    pair for a set of interactions. A state to action pair is of the form:
+
+    ((A, B), A)
+
+    implying that from a state of (A, B) (the first player having played A and
+    the second playing B) the player in question then played A.
+
+    The following counter object, implies that the player in question was only
+    ever in state (A, B), subsequently cooperating 1/3 of the time and defecting
+    2/3 times.
+
+    Counter({((A, B), A): 0.333333, ((A, B), B): 0.66666667})
+
+    Parameters
+    ----------
+    interactions : list of tuples
+        A list containing the interactions of the match as shown at the top of
+        this file.
+
+    Returns
+    -------
+    normalised_state_to_A_distributions : List of Counter Object
+        List of Counter objects where the keys are the states and actions and
+        the values the normalized counts. The first/second Counter corresponds
+        to the first/second player.
+    """
+    if not interactions:
+        return None
+
+    counts = compute_state_to_action_counts(
+        interactions_to_states(interactions))
+    counts[1] = counts[1][SWAPPED_STATE_TO_ACTIONS]
+    normalised = normalise_state_to_action_counts(counts)
+    return [Counter({key: rate for key, rate
+                     in zip(STATE_TO_ACTIONS, player_rates.tolist())
+                     if rate > 0})
+            for player_rates in normalised]
+
+
+def normalise_state_to_action_counts(counts):
+    """
+    Divides state to action counts, arrays whose last axis is in the order of
+    `STATE_TO_ACTIONS`, by the number of times each state occurs, leaving 0
+    for states that do not occur.
+    """
+    pairs = counts.reshape(counts.shape[:-1] + (len(STATES), 2))
+    totals = pairs.sum(axis=-1, keepdims=True)
+    rates = np.where(totals > 0, pairs / np.where(totals > 0, totals, 1), 0)
+    return rates.reshape(counts.shape)
 
 
 def read_interactions_from_file(filename, progress_bar=True):
     """
     Reads a file and returns a dictionary mapping tuples of player pairs to
-    lists of interactions
+    lists of interactions. The file can be a CSV file or a binary interaction
+    log.
     """
+    if is_interaction_log(filename):
+        return read_interactions_from_log(filename, progress_bar=progress_bar)
+
+    import pandas as pd
+    import tqdm
+
     df = pd.read_csv(filename)[["Interaction index", "Player index",
                                 "Opponent index", "Actions"]]
     groupby = df.groupby("Interaction index")
@@ -208,13 +306,41 @@ def read_interactions_from_file(filename, progress_bar=True):
         groupby = tqdm.tqdm(groupby)
 
     pairs_to_interactions = defaultdict(list)
-    for _, d in tqdm.tqdm(groupby):
+    for _, d in groupby:
         key = tuple(d[["Player index", "Opponent index"]].iloc[0])
         value = list(map(str_to_actions, zip(*d["Actions"])))
         pairs_to_interactions[key].append(value)
     return pairs_to_interactions
 
 
+def read_interactions_from_log(filename, progress_bar=True):
+    """
+    Reads a binary interaction log and returns a dictionary mapping tuples of
+    player pairs to lists of interactions
+    """
+    blocks = read_blocks(filename)
+    if progress_bar:
+        import tqdm
+        blocks = tqdm.tqdm(blocks)
+
+    first_rows = {}
+    pairs_to_interactions = defaultdict(list)
+    for records, actions in blocks:
+        for record in records:
+            history = bytes(unpack_actions(actions, record['actions_offset'],
+                                           record['turns']))
+            interaction_index = int(record['interaction_index'])
+            if interaction_index not in first_rows:
+                first_rows[interaction_index] = (record, history)
+                continue
+            first_record, first_history = first_rows.pop(interaction_index)
+            key = (int(first_record['player_index']),
+                   int(first_record['opponent_index']))
+            pairs_to_interactions[key].append(
+                list(Interactions(first_history, history)))
+    return pairs_to_interactions
+
+
 def string_to_interactions(string):
     """
     Converts a compact string representation of an interaction to an
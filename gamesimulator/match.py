@@ -1,10 +1,15 @@
+from collections import Counter
+from functools import partial
 from math import ceil, log
 import random
 
 from gamesimulator.action import Action
 from gamesimulator.game import Game
+from gamesimulator.history import History, Interactions, MatchRecord
+from gamesimulator.player import play_recorded_turn
 from gamesimulator import DEFAULT_TURNS
 import gamesimulator.interaction_utils as iu
+from gamesimulator.random_ import seed
 
 
 A, B = Action.A, Action.B
@@ -15,7 +20,8 @@ class Match(object):
     """The Match class conducts matches between two players."""
 
     def __init__(self, players, turns=None,
-                 game=None, match_attributes=None):
+                 game=None, match_attributes=None, fast_forward=False,
+                 compact_history=False, match_accounting=False, seed=None):
         """
         Parameters
         ----------
@@ -29,6 +35,23 @@ class Match(object):
             Mapping attribute names to values which should be passed to players.
             The default is to use the correct values for turns, game and noise
             but these can be overridden if desired.
+        fast_forward : bool
+            Whether or not to stop playing once two deterministic players with
+            a finite memory depth enter a cycle of joint actions, filling in
+            the rest of the match from the cycle.
+        compact_history : bool
+            Whether or not the players' histories are stored as
+            `gamesimulator.history.History` objects, in which case the result
+            is a `gamesimulator.history.Interactions` object.
+        match_accounting : bool
+            Whether or not only the players' histories are updated as the
+            match is played, their action counts and state distributions
+            being derived from a `gamesimulator.history.MatchRecord` of the
+            match when they are read.
+        seed : int
+            If given, the global `random` and `numpy.random` states are seeded
+            with it before every play of the match, so that matches between
+            stochastic players can be reproduced.
         """
 
         defaults = {(True): (DEFAULT_TURNS),
@@ -52,6 +75,10 @@ class Match(object):
             self.match_attributes = match_attributes
 
         self.players = list(players)
+        self.fast_forward = fast_forward
+        self.compact_history = compact_history
+        self.match_accounting = match_accounting
+        self.seed = seed
 
     @property
     def players(self):
@@ -67,6 +94,19 @@ class Match(object):
         self._players = newplayers
 
 
+    @property
+    def deterministic(self):
+        """Whether or not both players are declared to be deterministic, so
+        that every play of the match has the same result."""
+        return not any(player.classifier.get('stochastic', True)
+                       for player in self.players)
+
+    @property
+    def memory_depth(self):
+        """The largest memory depth declared by the players."""
+        return max(player.classifier.get('memory_depth', float('inf'))
+                   for player in self.players)
+
     def play(self):
         """
         The resulting list of actions from a match between two players.
@@ -84,19 +124,94 @@ class Match(object):
         i.e. One entry per turn containing a pair of actions.
         """
         turns = self.turns
-        
+        self._reset_players()
+        player_1, player_2 = self.players
+        if self.match_accounting and player_1 is not player_2:
+            MatchRecord(player_1, player_2)
+            self._play_turn = partial(play_recorded_turn, player_1, player_2)
+        else:
+            self._play_turn = partial(player_1.play, player_2)
+        if self.fast_forward and self.deterministic and \
+                self.memory_depth < float('inf'):
+            self._play_until_cycle()
+        else:
+            play_turn = self._play_turn
+            for _ in range(turns):
+                play_turn()
+        return self._store_result()
+
+    def _reset_players(self):
+        """Seeds the random state, if there is a seed, and resets the players
+        before a play of the match."""
+        if self.seed is not None:
+            seed(self.seed)
+
         for p in self.players:
             p.reset()
             p.set_match_attributes(**self.match_attributes)
-        for _ in range(turns):
-            self.players[0].play(self.players[1])
-        result = list(
-            zip(self.players[0].history, self.players[1].history))
-
+            if self.compact_history:
+                p.history = History()
+
+    def _store_result(self):
+        """Sets and returns the result of the match from the histories of the
+        players."""
+        if self.compact_history:
+            result = Interactions(self.players[0].history.raw,
+                                  self.players[1].history.raw)
+        else:
+            result = list(
+                zip(self.players[0].history, self.players[1].history))
 
         self.result = result
         return result
 
+    def _play_until_cycle(self):
+        """
+        Plays turns until the joint actions of the last `memory_depth` turns
+        repeat an earlier window. As the players are deterministic and only
+        look that far back, the match is periodic from there on and the
+        remaining turns are filled in without calling the strategies.
+        """
+        player_1, player_2 = self.players
+        depth = int(self.memory_depth)
+        seen = {}
+        for turn in range(self.turns):
+            if turn >= depth:
+                window = (tuple(player_1.history[turn - depth:turn]),
+                          tuple(player_2.history[turn - depth:turn]))
+                if window in seen:
+                    self._repeat_cycle(start=seen[window], end=turn)
+                    return
+                seen[window] = turn
+            self._play_turn()
+
+    def _repeat_cycle(self, start, end):
+        """
+        Extends the histories, action counts and state distributions of both
+        players by repeating the turns from `start` to `end` until the match
+        is `turns` long.
+        """
+        player_1, player_2 = self.players
+        period = end - start
+        repeats, remainder = divmod(self.turns - end, period)
+        cycles = [player.history[start:end] for player in self.players]
+        for player, cycle, opponent_cycle in ((player_1, *cycles),
+                                              (player_2, *cycles[::-1])):
+            moves = cycle * repeats + cycle[:remainder]
+            player.history.extend(moves)
+            if player._record is not None:
+                # The counts are derived from the histories
+                continue
+            player.action_a += moves.count(A)
+            player.action_b += moves.count(B)
+            states = Counter(zip(cycle, opponent_cycle))
+            tail_states = Counter(zip(cycle[:remainder],
+                                      opponent_cycle[:remainder]))
+            for state, count in states.items():
+                player.state_distribution[state] += count * repeats
+            for state, count in tail_states.items():
+                player.state_distribution[state] += count
+
     def scores(self):
         """Returns the scores of the previous Match plays."""
         return iu.compute_scores(self.result, self.game)
@@ -0,0 +1,124 @@
+"""
+An on-disk cache of the interactions of matches, used by a Tournament to only
+replay the matches of players that have changed since an earlier run.
+
+A player is identified by a fingerprint of the source of its class (and of
+the classes it inherits from) and of its `init_kwargs`. The interactions of
+every repetition of a match are stored in a file named by a hash of the
+fingerprints of both players and of the game, number of turns, number of
+repetitions and match attributes. The random streams of a seeded tournament
+depend on the positions of the players and on whether matches are played in
+bulk, so with a seed these are part of the key too.
+"""
+import hashlib
+import inspect
+import json
+import os
+from tempfile import NamedTemporaryFile
+
+import numpy as np
+
+from .history import Interactions
+
+
+def player_fingerprint(player):
+    """
+    Returns a fingerprint of the strategy and parameters of a player, or None
+    if the source of its class cannot be found (for example when it was
+    defined interactively), in which case its matches cannot be cached.
+    """
+    sources = []
+    for cls in type(player).__mro__:
+        if cls is object:
+            continue
+        try:
+            sources.append(inspect.getsource(cls))
+        except (OSError, TypeError):
+            return None
+    kwargs = sorted((key, repr(value))
+                    for key, value in player.init_kwargs.items())
+    description = json.dumps([sources, kwargs])
+    return hashlib.sha256(description.encode('utf-8')).hexdigest()
+
+
+class MatchCache(object):
+    """A directory holding the interactions of previously played matches."""
+
+    def __init__(self, directory):
+        """
+        Parameters
+        ----------
+            directory : string
+                The directory holding the cached matches, created if needed
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(fingerprints, game, turns, repetitions, match_attributes=None,
+            seed=None, index_pair=None, bulk=False):
+        """
+        Returns the key of a match between two players with the given
+        fingerprints, or None if either fingerprint is None.
+
+        `index_pair` and `bulk`, the positions of the players and whether the
+        match is played in bulk, only count when there is a seed.
+        """
+        if None in fingerprints:
+            return None
+        description = [list(fingerprints), list(game.RPST()), turns,
+                       repetitions, repr(sorted(match_attributes.items()))
+                       if match_attributes else None]
+        if seed is not None:
+            description.extend([seed, list(index_pair or ()), bool(bulk)])
+        return hashlib.sha256(
+            json.dumps(description).encode('utf-8')).hexdigest()
+
+    def _filename(self, key):
+        return os.path.join(self.directory, key + '.npz')
+
+    def __contains__(self, key):
+        return key is not None and os.path.exists(self._filename(key))
+
+    def get(self, key):
+        """
+        Returns the interactions of every repetition of a cached match as a
+        list of `gamesimulator.history.Interactions`, or None if it is not
+        in the cache.
+        """
+        if key not in self:
+            return None
+        with np.load(self._filename(key)) as data:
+            turns = int(data['turns'])
+            actions = [np.unpackbits(data[name], axis=1)[:, :turns]
+                       for name in ('actions_1', 'actions_2')]
+        return [Interactions(actions_1.tobytes(), actions_2.tobytes())
+                for actions_1, actions_2 in zip(*actions)]
+
+    def set(self, key, interactions):
+        """
+        Stores the interactions of every repetition of a match. The file is
+        written under a temporary name and moved into place so that
+        concurrent readers never see part of it.
+        """
+        if key is None:
+            return
+        actions = [[], []]  # type: list
+        for interaction in interactions:
+            if isinstance(interaction, Interactions):
+                raw = interaction.raw
+            else:
+                raw = [bytes(plays[index].value for plays in interaction)
+                       for index in (0, 1)]
+            for index in (0, 1):
+                actions[index].append(np.frombuffer(raw[index],
+                                                    dtype=np.uint8))
+        turns = len(actions[0][0]) if actions[0] else 0
+        with NamedTemporaryFile(dir=self.directory, suffix='.npz',
+                                delete=False) as file_obj:
+            np.savez(file_obj, turns=turns,
+                     actions_1=np.packbits(np.array(actions[0]).reshape(
+                         len(actions[0]), turns), axis=1),
+                     actions_2=np.packbits(np.array(actions[1]).reshape(
+                         len(actions[1]), turns), axis=1))
+        os.replace(file_obj.name, self._filename(key))
@@ -1,7 +1,14 @@
+import heapq
+
+from gamesimulator import DEFAULT_TURNS
+
 
 class MatchGenerator(object):
 
-    def __init__(self, players, repetitions, turns=None, game=None, match_attributes=None):
+    def __init__(self, players, repetitions, turns=None, game=None,
+                 match_attributes=None, fast_forward=False,
+                 compact_history=False, match_accounting=False,
+                 shard_index=0, num_shards=1):
         """
         A class to generate matches. This is used by the Tournament class which
         is in charge of playing the matches and collecting the results.
@@ -20,6 +27,22 @@ class MatchGenerator(object):
             Mapping attribute names to values which should be passed to players.
             The default is to use the correct values for turns, game and noise
             but these can be overridden if desired.
+        fast_forward : bool
+            Whether or not matches between deterministic players should stop
+            playing once they reach a cycle (see `Match`).
+        compact_history : bool
+            Whether or not players store their histories as
+            `gamesimulator.history.History` objects (see `Match`).
+        match_accounting : bool
+            Whether or not players derive their action counts and state
+            distributions from a shared record of each match (see `Match`).
+        shard_index : int
+            The index of the shard of the tournament to generate, from 0 to
+            `num_shards` - 1
+        num_shards : int
+            The number of shards the tournament is split into. Every match
+            belongs to exactly one shard and each shard has a balanced share
+            of the turns of the tournament (see `assign_shards`).
         """
         self.players = players
         self.turns = turns
@@ -27,9 +50,17 @@ class MatchGenerator(object):
         self.repetitions = repetitions
         self.opponents = players
         self.match_attributes = match_attributes
-
-        n = len(self.players)
-        self.size = int(n * (n - 1) // 2 + n)
+        self.fast_forward = fast_forward
+        self.compact_history = compact_history
+        self.match_accounting = match_accounting
+        if not 0 <= shard_index < num_shards:
+            raise ValueError(
+                "shard_index must be between 0 and num_shards - 1.")
+        self.shard_index = shard_index
+        self.num_shards = num_shards
+
+        self.edges = self._shard_edges()
+        self.size = len(self.edges)
 
     def __len__(self):
         return self.size
@@ -44,18 +75,33 @@ class MatchGenerator(object):
         tuples
             ((player1 index, player2 index), match object)
         """
-        edges = complete_graph(self.players)
-     
-        for index_pair in edges:
+        for index_pair in self.edges:
             match_params = self.build_single_match_params()
             yield (index_pair, match_params, self.repetitions)
 
+    def _shard_edges(self):
+        """
+        Returns the edges of the round robin in the shard being generated, in
+        their round robin order.
+        """
+        edges = list(complete_graph(self.players))
+        if self.num_shards == 1:
+            return edges
+        turns = DEFAULT_TURNS if self.turns is None else self.turns
+        costs = [turns * self.repetitions] * len(edges)
+        shards = assign_shards(costs, self.num_shards)
+        return [edge for edge, shard in zip(edges, shards)
+                if shard == self.shard_index]
+
     def build_single_match_params(self):
         """
         Creates a single set of match parameters.
         """
         return {"turns": self.turns, "game": self.game,
-                "match_attributes": self.match_attributes}
+                "match_attributes": self.match_attributes,
+                "fast_forward": self.fast_forward,
+                "compact_history": self.compact_history,
+                "match_accounting": self.match_accounting}
 
 
 def complete_graph(players):
@@ -67,6 +113,35 @@ def complete_graph(players):
             yield (player1_index, player2_index)
 
 
+def assign_shards(costs, num_shards):
+    """
+    Assigns items to shards so that the total cost of each shard is balanced.
+
+    Items are taken from the most to the least costly, ties in their original
+    order, and each is given to the shard with the smallest total cost so
+    far, ties going to the lowest shard index. The assignment only depends on
+    the costs and the number of shards.
+
+    Parameters
+    ----------
+    costs : list
+        The cost of each item, for example its number of turns
+    num_shards : int
+        The number of shards
+
+    Returns
+    -------
+    list : The shard index of each item
+    """
+    loads = [(0, shard) for shard in range(num_shards)]
+    shards = [0] * len(costs)
+    for index in sorted(range(len(costs)), key=lambda i: -costs[i]):
+        load, shard = heapq.heappop(loads)
+        shards[index] = shard
+        heapq.heappush(loads, (load + costs[index], shard))
+    return shards
+
+
 def graph_is_connected(edges, players):
     """
     Test if the set of edges defines a graph in which each player is connected
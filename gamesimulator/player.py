@@ -1,4 +1,3 @@
-from collections import defaultdict
 import copy
 import inspect
 import itertools
@@ -8,9 +7,10 @@ import numpy as np
 
 from gamesimulator.action import Action
 from .game import DefaultGame
+from .history import MatchRecord, StateDistribution
 
 import types
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 A, B = Action.A, Action.B
 
@@ -21,9 +21,9 @@ def update_history(player, move):
     player.history.append(move)
     # Update player counts of action A and action B
     if move == A:
-        player.action_a += 1
+        player._action_a += 1
     elif move == B:
-        player.action_b += 1
+        player._action_b += 1
 
 
 def get_state_distribution_from_history(player, history_1, history_2):
@@ -34,8 +34,41 @@ def get_state_distribution_from_history(player, history_1, history_2):
 
 def update_state_distribution(player, action, reply):
     """Updates state_distribution following play. """
-    last_turn = (action, reply)
-    player.state_distribution[last_turn] += 1
+    # Index the slot of (action, reply) in the order of STATES by identity,
+    # avoiding the hashing of a tuple of Actions on every turn.
+    player._state_distribution.counts[
+        (0 if action is A else 2) + (0 if reply is A else 1)] += 1
+
+
+def check_actions(player, opponent, s1, s2):
+    """
+    Raises a TypeError if either strategy returned an awaitable, which only
+    `gamesimulator.AsyncMatch` and `gamesimulator.AsyncTournament` await.
+    Called when a strategy returns something other than an Action.
+    """
+    owners = [owner for owner, action in ((player, s1), (opponent, s2))
+              if inspect.isawaitable(action)]
+    if not owners:
+        return
+    for action in (s1, s2):
+        if inspect.iscoroutine(action):
+            action.close()  # It will never be awaited
+    raise TypeError(
+        "The strategy of {} returned an awaitable. Asynchronous strategies "
+        "must be played with gamesimulator.AsyncMatch or "
+        "gamesimulator.AsyncTournament.".format(owners[0]))
+
+
+def play_recorded_turn(player, opponent):
+    """
+    Plays a turn of a match whose players share a
+    `gamesimulator.history.MatchRecord`: only the histories are updated.
+    """
+    s1, s2 = player.strategy(opponent), opponent.strategy(player)
+    if s1.__class__ is not Action or s2.__class__ is not Action:
+        check_actions(player, opponent, s1, s2)
+    player.history.append(s1)
+    opponent.history.append(s2)
 
 
 class Player(object):
@@ -46,6 +79,19 @@ class Player(object):
 
     name = "Player"
 
+    # The state that every player carries is held in slots rather than in the
+    # instance dictionary, which strategies keep for their own attributes.
+    __slots__ = ('init_kwargs', 'history', '_action_a', '_action_b',
+                 '_state_distribution', '_record', '_side', 'match_attributes',
+                 '__dict__', '__weakref__')
+
+    # Strategies can declare their memory depth (the number of previous turns
+    # their next action depends on) and whether they are stochastic. The
+    # defaults make no assumptions.
+    classifier = {
+        'memory_depth': float('inf'),
+        'stochastic': True
+    }  # type: Dict[str, Any]
 
     def __new__(cls, *args, **kwargs):
         """Caches arguments for Player cloning."""
@@ -54,13 +100,21 @@ class Player(object):
         return obj
 
     @classmethod
-    def init_params(cls, *args, **kwargs):
+    def init_signature(cls):
         """
-        Return a dictionary containing the init parameters of a strategy
-        (without 'self').
-        Use *args and *kwargs as value if specified
-        and complete the rest with the default values.
+        Return the signature of `__init__` (without 'self') and its default
+        values, computed once per class.
+
+        Returns
+        -------
+        A tuple (signature, defaults). defaults is a dictionary of the
+        default values of the parameters, or None if `__init__` takes *args or
+        **kwargs.
         """
+        cached = cls.__dict__.get('_init_signature')
+        if cached is not None:
+            return cached
+
         sig = inspect.signature(cls.__init__)
         # The 'self' parameter needs to be removed or the first *args will be
         # assigned to it
@@ -68,6 +122,28 @@ class Player(object):
         new_params = list(sig.parameters.values())
         new_params.remove(self_param)
         sig = sig.replace(parameters=new_params)
+
+        variadic = (inspect.Parameter.VAR_POSITIONAL,
+                    inspect.Parameter.VAR_KEYWORD)
+        defaults = None  # type: Optional[Dict[str, Any]]
+        if not any(param.kind in variadic for param in new_params):
+            defaults = {param.name: param.default for param in new_params
+                        if param.default is not param.empty}
+
+        cls._init_signature = (sig, defaults)
+        return cls._init_signature
+
+    @classmethod
+    def init_params(cls, *args, **kwargs):
+        """
+        Return a dictionary containing the init parameters of a strategy
+        (without 'self').
+        Use *args and *kwargs as value if specified
+        and complete the rest with the default values.
+        """
+        sig, defaults = cls.init_signature()
+        if not args and not kwargs and defaults is not None:
+            return dict(defaults)
         boundargs = sig.bind_partial(*args, **kwargs)
         boundargs.apply_defaults()
         return boundargs.arguments
@@ -77,7 +153,9 @@ class Player(object):
         self.history = []
         self.action_a = 0
         self.action_b = 0
-        self.state_distribution = defaultdict(int)
+        self.state_distribution = StateDistribution()
+        self._record = None  # type: Optional[MatchRecord]
+        self._side = 0
         self.set_match_attributes()
 
     def __eq__(self, other):
@@ -87,7 +165,8 @@ class Player(object):
         if self.__repr__() != other.__repr__():
             return False
 
-        for attribute in set(list(self.__dict__.keys()) +
+        for attribute in set(self._state_attributes() +
+                             list(self.__dict__.keys()) +
                              list(other.__dict__.keys())):
 
             value = getattr(self, attribute, None)
@@ -131,6 +210,48 @@ class Player(object):
                     return False
         return True
 
+    @staticmethod
+    def _state_attributes():
+        """The names of the attributes held in the slots of `Player`."""
+        return ['init_kwargs', 'history', 'action_a', 'action_b',
+                'state_distribution', 'match_attributes']
+
+    # The counters are derived from the shared record of the match when the
+    # player is playing with match accounting (see `Match`).
+    @property
+    def action_a(self):
+        if self._record is None:
+            return self._action_a
+        return self._record.action_count(self._side, A)
+
+    @action_a.setter
+    def action_a(self, value):
+        self._action_a = value
+
+    @property
+    def action_b(self):
+        if self._record is None:
+            return self._action_b
+        return self._record.action_count(self._side, B)
+
+    @action_b.setter
+    def action_b(self, value):
+        self._action_b = value
+
+    @property
+    def state_distribution(self):
+        if self._record is None:
+            return self._state_distribution
+        state_distribution = StateDistribution()
+        state_distribution.counts = self._record.state_counts(self._side)
+        return state_distribution
+
+    @state_distribution.setter
+    def state_distribution(self, value):
+        if not isinstance(value, StateDistribution):
+            value = StateDistribution(value)
+        self._state_distribution = value
+
     def receive_match_attributes(self):
         # Overwrite this function if your strategy needs
         # to make use of match_attributes such as
@@ -166,9 +287,28 @@ class Player(object):
         """This is a placeholder strategy."""
         raise NotImplementedError()
 
+    def memory_one_table(self):
+        """
+        Describes the strategy as a lookup table on the previous turn.
+
+        Strategies whose next action depends only on the previous joint
+        action can override this so that they can be played in bulk by
+        `gamesimulator.bulk_match`.
+
+        Returns
+        -------
+        None if the strategy cannot be described this way, otherwise a tuple
+        (first, (aa, ab, ba, bb)) giving the probability of playing A on the
+        first turn and after each of the joint actions (A, A), (A, B), (B, A)
+        and (B, B), seen from this player's point of view.
+        """
+        return None
+
     def play(self, opponent, noise=0):
         """This pits two players against each other."""
         s1, s2 = self.strategy(opponent), opponent.strategy(self)
+        if s1.__class__ is not Action or s2.__class__ is not Action:
+            check_actions(self, opponent, s1, s2)
         update_history(self, s1)
         update_history(opponent, s2)
         update_state_distribution(self, s1, s2)
@@ -183,7 +323,14 @@ class Player(object):
         # be significant changes required throughout the library.
         # Override in special cases only if absolutely necessary
         cls = self.__class__
-        new_player = cls(**self.init_kwargs)
+        _, defaults = cls.init_signature()
+        if cls.__new__ is Player.__new__ and defaults is not None:
+            # init_kwargs are already bound: skip binding them again
+            new_player = object.__new__(cls)
+            new_player.init_kwargs = dict(self.init_kwargs)
+            new_player.__init__(**self.init_kwargs)
+        else:
+            new_player = cls(**self.init_kwargs)
         new_player.match_attributes = copy.copy(self.match_attributes)
         return new_player
 
@@ -197,6 +344,7 @@ class Player(object):
         self.history = []
         self.action_a = 0
         self.action_b = 0
-        self.state_distribution = defaultdict(int)
+        self.state_distribution = StateDistribution()
+        self._record = None
         self.__init__(**self.init_kwargs)
 
@@ -1,7 +1,7 @@
 from distutils.version import LooseVersion
 
 from .result_set import ResultSet
-from numpy import arange, median, nan_to_num
+from numpy import arange, isnan, ix_, nanmedian
 import tqdm
 
 from typing import List, Union
@@ -61,8 +61,10 @@ class Plot(object):
 
     @property
     def _boxplot_dataset(self):
-        return [list(nan_to_num(self.result_set.normalised_scores[ir]))
-                for ir in self.result_set.ranking]
+        # Repetitions a player took no part in (see `ResultSet.merge`) are NaN
+        normalised_scores = self.result_set.normalised_scores
+        return [scores[~isnan(scores)]
+                for scores in normalised_scores[self.result_set.ranking]]
 
     @property
     def _boxplot_xticks_locations(self):
@@ -85,11 +87,11 @@ class Plot(object):
     def _winplot_dataset(self):
         # Sort wins by median
         wins = self.result_set.wins
-        medians = map(median, wins)
+        medians = nanmedian(wins, axis=1)
         medians = sorted(
             [(m, i) for (i, m) in enumerate(medians)], reverse=True)
         # Reorder and grab names
-        wins = [wins[x[-1]] for x in medians]
+        wins = [row[~isnan(row)] for row in wins[[x[-1] for x in medians]]]
         ranked_names = [str(self.players[x[-1]]) for x in medians]
         return wins, ranked_names
 
@@ -112,10 +114,9 @@ class Plot(object):
     @property
     def _sdv_plot_dataset(self):
         ordering = self._sd_ordering
-        diffs = [[score_diff for opponent in player for score_diff in opponent]
-                 for player in self.result_set.score_diffs]
+        diffs = self.result_set.score_diffs.reshape(self.num_players, -1)
         # Reorder and grab names
-        diffs = [diffs[i] for i in ordering]
+        diffs = list(diffs[ordering])
         ranked_names = [str(self.players[i]) for i in ordering]
         return diffs, ranked_names
 
@@ -131,9 +132,8 @@ class Plot(object):
     @property
     def _lengthplot_dataset(self):
         match_lengths = self.result_set.match_lengths
-        return [[length for rep in match_lengths
-                 for length in rep[playeri]] for playeri in
-                self.result_set.ranking]
+        return [match_lengths[:, playeri].ravel()
+                for playeri in self.result_set.ranking]
 
     def lengthplot(
         self, title: titleType = None, ax: matplotlib.axes.SubplotBase = None
@@ -146,10 +146,8 @@ class Plot(object):
 
     @property
     def _payoff_dataset(self):
-        pm = self.result_set.payoff_matrix
-        return [[pm[r1][r2]
-                 for r2 in self.result_set.ranking]
-                for r1 in self.result_set.ranking]
+        ranking = self.result_set.ranking
+        return self.result_set.payoff_matrix[ix_(ranking, ranking)]
 
     @property
     def _pdplot_dataset(self):
@@ -157,8 +155,7 @@ class Plot(object):
         ordering = self._sd_ordering
         pdm = self.result_set.payoff_diffs_means
         # Reorder and grab names
-        matrix = [[pdm[r1][r2] for r2 in ordering]
-                  for r1 in ordering]
+        matrix = pdm[ix_(ordering, ordering)]
         players = self.result_set.players
         ranked_names = [str(players[i]) for i in ordering]
         return matrix, ranked_names
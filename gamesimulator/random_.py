@@ -3,28 +3,47 @@ import numpy
 from gamesimulator.action import Action
 
 
-def random_choice(p: float = 0.5) -> Action:
+def random_choice(p=0.5, size=None, generator=None):
     """
     Return A with probability `p`, else return B
 
     No random sample is carried out if p is 0 or 1.
 
+    If `size` is given, `size` choices are made at once and returned as an
+    array of action values, 1 for A and 0 for B. `p` can then be an array of
+    probabilities, one per choice, for instance one per repetition of a
+    match.
+
     Parameters
     ----------
-    p : float
+    p : float or array
         The probability of picking A
+    size : int or tuple
+        The number of choices to make, or None for a single choice
+    generator : numpy.random.Generator
+        The source of random numbers. By default the global `random` module
+        is used for a single choice and `numpy.random` for several.
 
     Returns
     -------
-    gamesimulator.Action
+    gamesimulator.Action, or an array of action values if `size` is given
     """
+    if size is not None:
+        if generator is None:
+            generator = numpy.random
+        draws = generator.random(size)
+        return (draws < numpy.asarray(p)).astype(numpy.uint8)
+
     if p == 0:
         return Action.B
 
     if p == 1:
         return Action.A
 
-    r = random.random()
+    if generator is None:
+        r = random.random()
+    else:
+        r = generator.random()
     if r < p:
         return Action.A
     return Action.B
@@ -44,19 +63,120 @@ def seed(seed_):
     numpy.random.seed(seed_)
 
 
+def _repetition_sequence(seed_, player_index, opponent_index, repetition):
+    return numpy.random.SeedSequence(
+        seed_, spawn_key=(player_index, opponent_index, repetition))
+
+
+def repetition_seed(seed_, player_index, opponent_index, repetition):
+    """
+    Returns the seed of a repetition of a match in a seeded tournament, used
+    to seed the global random state before it is played (see `Match`).
+
+    Like `repetition_generator` it only depends on the tournament seed and
+    the position of the repetition in the tournament.
+
+    Returns
+    -------
+    int
+    """
+    sequence = _repetition_sequence(seed_, player_index, opponent_index,
+                                    repetition)
+    return int(sequence.generate_state(1)[0])
+
+
+def repetition_generator(seed_, player_index, opponent_index, repetition):
+    """
+    Returns the random number generator of a repetition of a match in a
+    seeded tournament.
+
+    Every repetition has its own stream, derived from the tournament seed and
+    its position in the tournament, so that it does not depend on the order
+    in which matches are played or on the number of processes playing them.
+
+    Parameters
+    ----------
+    seed_ : int
+        The seed of the tournament
+    player_index, opponent_index : int
+        The indices of the players of the match
+    repetition : int
+        The index of the repetition
+
+    Returns
+    -------
+    numpy.random.Generator
+    """
+    sequence = _repetition_sequence(seed_, player_index, opponent_index,
+                                    repetition)
+    return numpy.random.default_rng(sequence)
+
+
 class Pdf(object):
-    """A class for a probability distribution"""
+    """A class for a probability distribution
+
+    Samples are drawn in constant time using the alias method of Walker, as
+    described by Vose: the sample space is split into `size` equally likely
+    columns, each holding an outcome with probability `alias_probability` and
+    otherwise its alias.
+    """
     def __init__(self, counter):
         """Take as an instance of collections.counter"""
         self.sample_space, self.counts = zip(*counter.items())
         self.size = len(self.sample_space)
         self.total = sum(self.counts)
         self.probability = list([v / self.total for v in self.counts])
+        self.alias_probability, self.alias = self._build_alias_table()
 
-    def sample(self):
-        """Sample from the pdf"""
-        index = numpy.random.choice(a=range(self.size), p=self.probability)
-        # Numpy cannot sample from a list of n dimensional objects for n > 1,
-        # need to sample an index.
-        return self.sample_space[index]
+    def _build_alias_table(self):
+        """Returns the alias probability and alias of every column."""
+        size = self.size
+        scaled = [p * size for p in self.probability]
+        alias_probability = [1.0] * size
+        alias = list(range(size))
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            alias_probability[less] = scaled[less]
+            alias[less] = more
+            scaled[more] = (scaled[more] + scaled[less]) - 1
+            if scaled[more] < 1:
+                small.append(more)
+            else:
+                large.append(more)
+        # Whatever is left has a probability of 1 up to rounding errors.
+        return alias_probability, alias
+
+    def sample(self, n=None, generator=None):
+        """Sample from the pdf
 
+        Parameters
+        ----------
+        n : int
+            The number of samples to draw, or None for a single sample
+        generator : numpy.random.Generator
+            The source of random numbers, `numpy.random` by default
+
+        Returns
+        -------
+        An element of the sample space, or a list of `n` of them
+        """
+        if generator is None:
+            generator = numpy.random
+        if n is None:
+            column = generator.random() * self.size
+            index = min(int(column), self.size - 1)
+            if column - index >= self.alias_probability[index]:
+                index = self.alias[index]
+            return self.sample_space[index]
+
+        columns = generator.random(n) * self.size
+        indices = numpy.minimum(columns.astype(int), self.size - 1)
+        aliased = columns - indices >= numpy.take(self.alias_probability,
+                                                  indices)
+        indices = numpy.where(aliased, numpy.take(self.alias, indices),
+                              indices)
+        # Numpy cannot sample from a list of n dimensional objects for n > 1,
+        # need to sample indices.
+        return [self.sample_space[index] for index in indices]
@@ -1,18 +1,20 @@
 from collections import namedtuple, Counter
 from multiprocessing import cpu_count
 import csv
-import itertools
+from math import fsum
 
 import numpy as np
 import tqdm
 
-import dask as da
-import dask.dataframe as dd
-
-from gamesimulator.action import Action, str_to_actions
+from gamesimulator.action import Action, STATES, str_to_actions
 import gamesimulator.interaction_utils as iu
+from .interaction_log import (CSV_STATE_COLUMNS, CSV_STATE_TO_ACTION_COLUMNS,
+                              is_interaction_log, read_blocks,
+                              read_csv_blocks, read_score_dtype)
 from .game import Game
 
+from typing import Optional
+
 
 A, B = Action.A, Action.B
 
@@ -32,20 +34,171 @@ def update_progress_bar(method):
     return wrapper
 
 
+class ResultAccumulator(object):
+    """
+    Running sums of the results of a tournament, added to one interaction at a
+    time as matches complete. A ResultSet can be built from these without
+    reading the interactions back from file.
+
+    Each sum is held in an array indexed by (player index, opponent index,
+    repetition), apart from the state counts and state to action counts
+    which are summed over repetitions and indexed by (player index, opponent
+    index, state) and (player index, opponent index, state to action pair).
+    `present` records, by (player index, repetition), which players took part
+    in each repetition, which only differs from True once accumulators of
+    different players are combined (see `insert`).
+    """
+
+    def __init__(self, num_players, repetitions, score_dtype=float):
+        """
+        Parameters
+        ----------
+            num_players : int
+                The number of players in the tournament
+            repetitions : int
+                The number of repetitions of each match
+            score_dtype : numpy.dtype
+                The type of the scores, that of `Game.payoff_array`
+        """
+        self.num_players = num_players
+        self.repetitions = repetitions
+        shape = (num_players, num_players, repetitions)
+        self.interactions = np.zeros(shape, dtype=np.int64)
+        self.scores = np.zeros(shape, dtype=score_dtype)
+        self.scores_per_turn = np.zeros(shape)
+        self.score_diffs_per_turn = np.zeros(shape)
+        self.turns = np.zeros(shape, dtype=np.int64)
+        self.wins = np.zeros(shape, dtype=np.int64)
+        self.state_counts = np.zeros((num_players, num_players, len(STATES)),
+                                     dtype=np.int64)
+        self.state_to_action_counts = np.zeros(
+            (num_players, num_players, len(iu.STATE_TO_ACTIONS)),
+            dtype=np.int64)
+        self.present = np.ones((num_players, repetitions), dtype=bool)
+
+    def add(self, player_index, opponent_index, repetition, score,
+            score_per_turn, score_diff_per_turn, turns, win, state_counts,
+            state_to_action_counts=None):
+        """
+        Adds the results of an interaction from the point of view of
+        the player.
+
+        Parameters
+        ----------
+            player_index : int
+            opponent_index : int
+            repetition : int
+            score : int or float
+            score_per_turn : float
+            score_diff_per_turn : float
+            turns : int
+            win : int
+                1 if the player won the match, otherwise 0
+            state_counts : list
+                The number of times each state in `STATES` occurs, seen from
+                the player's point of view
+            state_to_action_counts : list
+                The number of times the player moves from each state to each
+                action, in the order of
+                `gamesimulator.interaction_utils.STATE_TO_ACTIONS`
+        """
+        key = player_index, opponent_index, repetition
+        self.interactions[key] += 1
+        self.scores[key] += score
+        self.scores_per_turn[key] += score_per_turn
+        self.score_diffs_per_turn[key] += score_diff_per_turn
+        self.turns[key] += turns
+        self.wins[key] += win
+        self.state_counts[player_index, opponent_index] += state_counts
+        if state_to_action_counts is not None:
+            self.state_to_action_counts[player_index, opponent_index] += \
+                state_to_action_counts
+
+    def add_records(self, records):
+        """
+        Adds the results of many interactions at once.
+
+        Parameters
+        ----------
+            records : numpy.array
+                A record array with the columns of
+                `gamesimulator.interaction_log.RECORD_DTYPE` and
+                `gamesimulator.interaction_log.RESULT_DTYPE`
+        """
+        key = (records['player_index'], records['opponent_index'],
+               records['repetition'])
+        np.add.at(self.interactions, key, 1)
+        np.add.at(self.scores, key,
+                  records['score'].astype(self.scores.dtype))
+        np.add.at(self.scores_per_turn, key, records['score_per_turn'])
+        np.add.at(self.score_diffs_per_turn, key,
+                  records['score_difference_per_turn'])
+        np.add.at(self.turns, key, records['turns'])
+        np.add.at(self.wins, key, records['win'])
+        np.add.at(self.state_counts, key[:2], records['state_counts'])
+        # Logs written before these counts existed do not hold them
+        if 'state_to_action_counts' in records.dtype.names:
+            np.add.at(self.state_to_action_counts, key[:2],
+                      records['state_to_action_counts'])
+
+    def insert(self, other, player_indices, first_repetition=0):
+        """
+        Adds the sums of another accumulator, whose players and repetitions
+        are a subset of these.
+
+        Parameters
+        ----------
+            other : ResultAccumulator
+            player_indices : list
+                The index here of each player of `other`
+            first_repetition : int
+                The index here of the first repetition of `other`
+        """
+        players = np.asarray(player_indices, dtype=np.intp)
+        repetitions = np.arange(first_repetition,
+                                first_repetition + other.repetitions)
+        key = np.ix_(players, players, repetitions)
+        for name in ('interactions', 'scores', 'scores_per_turn',
+                     'score_diffs_per_turn', 'turns', 'wins'):
+            getattr(self, name)[key] += getattr(other, name)
+        self.state_counts[np.ix_(players, players)] += other.state_counts
+        self.state_to_action_counts[np.ix_(players, players)] += \
+            other.state_to_action_counts
+        self.present[np.ix_(players, repetitions)] |= other.present
+
+    def add_file(self, filename):
+        """
+        Adds the results of every interaction in a CSV file or binary
+        interaction log written by a Tournament with results.
+        """
+        if is_interaction_log(filename):
+            for records, _ in read_blocks(filename):
+                if 'score' not in records.dtype.names:
+                    raise ValueError(
+                        "{} does not contain results.".format(filename))
+                self.add_records(records)
+        else:
+            for records in read_csv_blocks(filename):
+                self.add_records(records)
+
+
 class ResultSet():
     """
-    A class to hold the results of a tournament. Reads in a CSV file produced
-    by the tournament class.
+    A class to hold the results of a tournament. Reads in a CSV file or
+    binary interaction log produced by the tournament class, or is built from
+    a ResultAccumulator.
     """
 
     def __init__(self, filename,
                  players, repetitions,
-                 processes=None, progress_bar=True):
+                 processes=None, progress_bar=True, accumulator=None,
+                 backend='numpy'):
         """
         Parameters
         ----------
             filename : string
-                the file from which to read the interactions
+                the file from which to read the interactions, ignored if an
+                accumulator is given
             players : list
                 A list of the names of players. If not known will be efficiently
                 read from file.
@@ -53,29 +206,110 @@ class ResultSet():
                 The number of repetitions of each match. If not know will be
                 efficiently read from file.
             processes : integer
-                The number of processes to be used for parallel processing
+                The number of processes to be used for parallel processing by
+                the dask backend
+            progress_bar : bool
+                Whether or not to create a progress bar which will be updated
+            accumulator : ResultAccumulator
+                The running sums of the results of the tournament
+            backend : string
+                How a CSV file is read: 'numpy' reads it in a single pass
+                into a ResultAccumulator, whose memory use depends on the
+                number of players and repetitions but not on the size of the
+                file. 'dask' analyses it with dask dataframes instead.
         """
         self.filename = filename
         self.players, self.repetitions = players, repetitions
         self.num_players = len(self.players)
+        self.accumulator = None  # type: Optional[ResultAccumulator]
 
         if progress_bar:
             self.progress_bar = tqdm.tqdm(total=25,
                                           desc="Analysing")
 
-        df = dd.read_csv(filename)
-        dask_tasks = self._build_tasks(df)
+        if backend not in ('numpy', 'dask'):
+            raise ValueError("backend must be 'numpy' or 'dask'.")
+
+        if accumulator is None and (backend == 'numpy' or
+                                    is_interaction_log(filename)):
+            accumulator = ResultAccumulator(
+                self.num_players, repetitions,
+                score_dtype=read_score_dtype(filename))
+            accumulator.add_file(filename)
 
-        if processes == 0:
-            processes = cpu_count()
+        if accumulator is None:
+            import dask.dataframe as dd
+            df = dd.read_csv(filename, float_precision='round_trip')
+            dask_tasks = self._build_tasks(df)
 
-        out = self._compute_tasks(tasks=dask_tasks, processes=processes)
+            if processes == 0:
+                processes = cpu_count()
 
-        self._reshape_out(*out)
+            out = self._compute_tasks(tasks=dask_tasks, processes=processes)
+
+            self._reshape_out(*out)
+        else:
+            self._reshape_accumulator(accumulator)
 
         if progress_bar:
             self.progress_bar.close()
 
+    def _reshape_accumulator(self, accumulator):
+        """
+        Reduce the running sums of a ResultAccumulator to the required form and
+        set the corresponding attributes, as `_reshape_out` does for the
+        output of the dask tasks. The accumulator is kept so that result sets
+        can be merged (see `merge`).
+        """
+        self.accumulator = accumulator
+        counts = accumulator.interactions
+        played = counts > 0
+        divisor = np.where(played, counts, 1)
+
+        self.payoffs = np.where(
+            played, accumulator.scores_per_turn / divisor, 0)
+        self.score_diffs = np.where(
+            played, accumulator.score_diffs_per_turn / divisor, 0)
+
+        match_lengths = np.where(played, accumulator.turns / divisor, 0)
+        self.match_lengths = np.ascontiguousarray(
+            match_lengths.transpose(2, 0, 1))
+
+        # Self interactions do not count towards wins and scores
+        opponents = ~np.eye(self.num_players, dtype=bool)[:, :, np.newaxis]
+        self.wins = (accumulator.wins * opponents).sum(axis=1)
+        self.scores = (accumulator.scores * opponents).sum(axis=1)
+        # Repetitions a player took no part in are ignored by medians
+        if not accumulator.present.all():
+            self.wins = np.where(accumulator.present, self.wins, np.nan)
+            self.scores = np.where(accumulator.present, self.scores, np.nan)
+
+        # Summed exactly, so that the means do not depend on the order in
+        # which interactions were written. pandas, and so the dask backend,
+        # sums in file order and may differ in the last bit (see `__eq__`).
+        interactions = (counts * opponents).sum(axis=1)
+        scores_per_turn = (accumulator.scores_per_turn * opponents).transpose(0, 2, 1)
+        sums = np.array([fsum(scores) for scores in
+                         scores_per_turn.reshape(-1, self.num_players).tolist()])
+        sums = sums.reshape(interactions.shape)
+        self.normalised_scores = np.where(
+            interactions > 0, sums / np.where(interactions > 0, interactions, 1),
+            0)
+        self.normalised_scores[~accumulator.present] = np.nan
+
+        self.state_distribution = accumulator.state_counts * opponents
+        self.normalised_state_distribution = self._build_normalised_state_distribution()
+
+        self.state_to_action_distribution = (
+            accumulator.state_to_action_counts * opponents)
+        self.normalised_state_to_action_distribution = \
+            self._build_normalised_state_to_action_distribution()
+
+        self.ranking = self._build_ranking()
+        self.ranked_names = self._build_ranked_names()
+
+        self._build_payoff_summaries(played)
+
     def _reshape_out(self,
                      mean_per_reps_player_opponent_df,
                      sum_per_player_opponent_df,
@@ -87,228 +321,190 @@ class ResultSet():
         set the corresponding attributes.
         """
 
-        # self.payoffs = self._reshape_three_dim_list(
-#                 mean_per_reps_player_opponent_df["Score per turn"],
-#                 first_dimension=range(self.num_players),
-#                 second_dimension=range(self.num_players),
-#                 third_dimension=range(self.repetitions),
-#                 key_order=[2, 0, 1])
-
-        self.score_diffs = self._reshape_three_dim_list(
-                mean_per_reps_player_opponent_df["Score difference per turn"],
-                first_dimension=range(self.num_players),
-                second_dimension=range(self.num_players),
-                third_dimension=range(self.repetitions),
-                key_order=[2, 0, 1],
-                alternative=0)
-
-        self.match_lengths = self._reshape_three_dim_list(
-                mean_per_reps_player_opponent_df["Turns"],
-                first_dimension=range(self.repetitions),
-                second_dimension=range(self.num_players),
-                third_dimension=range(self.num_players),
-                alternative=0)
-
-        self.wins = self._reshape_two_dim_list(sum_per_player_repetition_df["Win"])
-        self.scores = self._reshape_two_dim_list(sum_per_player_repetition_df["Score"])
-        self.normalised_scores = self._reshape_two_dim_list(normalised_scores_series)
-
-        columns = ["AA count", "AB count", "BA count", "BB count"]
-        self.state_distribution = self._build_state_distribution(sum_per_player_opponent_df[columns])
+        n, repetitions = self.num_players, self.repetitions
+        # The index of these is (repetition, player, opponent)
+        self.payoffs = self._series_to_array(
+            mean_per_reps_player_opponent_df["Score per turn"],
+            shape=(n, n, repetitions), levels=[1, 2, 0])
+        played = self._series_to_array(
+            mean_per_reps_player_opponent_df["Turns"].notnull(),
+            shape=(n, n, repetitions), levels=[1, 2, 0])
+        self.score_diffs = self._series_to_array(
+            mean_per_reps_player_opponent_df["Score difference per turn"],
+            shape=(n, n, repetitions), levels=[1, 2, 0])
+        self.match_lengths = self._series_to_array(
+            mean_per_reps_player_opponent_df["Turns"],
+            shape=(repetitions, n, n), levels=[0, 1, 2])
+
+        # The index of these is (player, repetition)
+        self.wins = self._series_to_array(
+            sum_per_player_repetition_df["Win"], shape=(n, repetitions))
+        self.scores = self._series_to_array(
+            sum_per_player_repetition_df["Score"], shape=(n, repetitions))
+        self.normalised_scores = self._series_to_array(
+            normalised_scores_series, shape=(n, repetitions))
+
+        self.state_distribution = self._sums_to_array(
+            sum_per_player_opponent_df, CSV_STATE_COLUMNS)
         self.normalised_state_distribution = self._build_normalised_state_distribution()
 
-        # columns = ["AA to A count",
-#                    "AA to B count",
-#                    "AB to A count",
-#                    "AB to B count",
-#                    "BA to A count",
-#                    "BA to B count",
-#                    "BB to A count",
-#                    "BB to B count"]
-#         self.state_to_action_distribution = self._build_state_to_action_distribution(sum_per_player_opponent_df[columns])
-#         self.normalised_state_to_action_distribution = self._build_normalised_state_to_action_distribution()
+        self.state_to_action_distribution = self._sums_to_array(
+            sum_per_player_opponent_df, CSV_STATE_TO_ACTION_COLUMNS)
+        self.normalised_state_to_action_distribution = \
+            self._build_normalised_state_to_action_distribution()
 
         self.ranking = self._build_ranking()
         self.ranked_names = self._build_ranked_names()
 
-        # self.payoff_matrix = self._build_summary_matrix(self.payoffs)
-#         self.payoff_stddevs = self._build_summary_matrix(self.payoffs,
-#                                                          func=np.std)
-
-        # self.payoff_diffs_means = self._build_payoff_diffs_means()
+        self._build_payoff_summaries(played)
 
     @update_progress_bar
-    def _reshape_three_dim_list(self, series,
-                                first_dimension,
-                                second_dimension,
-                                third_dimension,
-                                alternative=None,
-                                key_order=[0, 1, 2]):
+    def _series_to_array(self, series, shape, levels=None):
         """
         Parameters
         ----------
 
-            payoffs_series : pandas.Series
-            first_dimension : iterable
-            second_dimension : iterable
-            third_dimension : iterable
-            alternative : int
-                What to do if there is no entry at given position
-            key_order : list
-                Indices re-ording the dimensions to the correct keys in the
-                series
+            series : pandas.Series
+                A series with a MultiIndex
+            shape : tuple
+                The shape of the array
+            levels : list
+                The level of the index giving the position along each
+                dimension of the array, by default the levels in order
 
         Returns:
         --------
-            A three dimensional list across the three dimensions
-        """
-        series_dict = series.to_dict()
-        output = []
-        for first_index in first_dimension:
-            matrix = []
-            for second_index in second_dimension:
-                row = []
-                for third_index in third_dimension:
-                    key = (first_index, second_index, third_index)
-                    key = tuple([key[order] for order in key_order])
-                    if key in series_dict:
-                        row.append(series_dict[key])
-                    elif alternative is not None:
-                        row.append(alternative)
-                matrix.append(row)
-            output.append(matrix)
-        return output
+            A dense array holding the values of the series, and 0 where the
+            series has no entry
+        """
+        index = np.array(series.index.tolist(), dtype=np.intp).reshape(
+            len(series), -1)
+        if levels is not None:
+            index = index[:, levels]
+        array = np.zeros(shape, dtype=series.values.dtype)
+        array[tuple(index.T)] = series.values
+        return array
 
     @update_progress_bar
-    def _reshape_two_dim_list(self, series):
+    def _sums_to_array(self, sum_per_player_opponent_df, columns):
         """
-        Parameters
-        ----------
-
-            series : pandas.Series
-
-        Returns:
-        --------
-            A two dimensional list across repetitions and opponents
+        Returns the sums of the given count columns for each player and
+        opponent as an array of shape (players, opponents, columns), 0 for
+        columns missing from files written before they existed.
         """
-        series_dict = series.to_dict()
-        out = [[series_dict.get((player_index, repetition), 0)
-                  for repetition in range(self.repetitions)]
-                 for player_index in range(self.num_players)]
-        return out
-
+        n = self.num_players
+        array = np.zeros((n, n, len(columns)), dtype=np.int64)
+        index = tuple(np.array(sum_per_player_opponent_df.index.tolist(),
+                               dtype=np.intp).reshape(-1, 2).T)
+        for position, column in enumerate(columns):
+            if column in sum_per_player_opponent_df:
+                array[index + (position,)] = \
+                    sum_per_player_opponent_df[column].values
+        # Self interactions do not count towards state distributions
+        array[np.arange(n), np.arange(n)] = 0
+        return array
 
     @update_progress_bar
-    def _build_summary_matrix(self, attribute, func=np.mean):
-        matrix = [[0 for opponent_index in range(self.num_players)]
-                  for player_index in range(self.num_players)]
+    def _build_payoff_summaries(self, played):
+        """
+        Sets the mean and standard deviation over repetitions of the payoff
+        of each pair of players, and the mean of their score difference.
 
-        pairs = itertools.product(range(self.num_players), repeat=2)
+        The sums of the payoffs of each pair, and of their squared deviations
+        from the mean, are taken over the repetitions in which they played,
+        and pairs that never played are given 0.
 
-        for player_index, opponent_index in pairs:
-            utilities = attribute[player_index][opponent_index]
-            if utilities:
-                matrix[player_index][opponent_index] = func(utilities)
+        Parameters
+        ----------
+            played : numpy.array
+                Whether each pair of players played in each repetition,
+                indexed by (player index, opponent index, repetition)
+        """
+        repetitions = played.sum(axis=2)
+        divisor = np.where(repetitions > 0, repetitions, 1)
 
-        return matrix
+        payoffs = np.where(played, self.payoffs, 0)
+        self.payoff_matrix = payoffs.sum(axis=2) / divisor
+        # Centred first, so that identical payoffs have a deviation of 0
+        deviations = np.where(
+            played, self.payoffs - self.payoff_matrix[:, :, np.newaxis], 0)
+        self.payoff_stddevs = np.sqrt((deviations ** 2).sum(axis=2) / divisor)
 
-    # @update_progress_bar
-#     def _build_payoff_diffs_means(self):
-#         payoff_diffs_means = [[np.mean(diff) for diff in player]
-#                                for player in self.score_diffs]
-# 
-#         return payoff_diffs_means
+        score_diffs = np.where(played, self.score_diffs, 0)
+        self.payoff_diffs_means = score_diffs.sum(axis=2) / divisor
 
     @update_progress_bar
-    def _build_state_distribution(self, state_distribution_series):
-        state_key_map = {'AA count': (A, A),
-                         'AB count': (A, B),
-                         'BA count': (B, A),
-                         'BB count': (B, B)}
-        state_distribution = [[create_counter_dict(state_distribution_series,
-                                                   player_index,
-                                                   opponent_index,
-                                                   state_key_map)
-                               for opponent_index in range(self.num_players)]
-                              for player_index in range(self.num_players)]
-        return state_distribution
+    def _build_normalised_state_distribution(self):
+        """
+        Returns:
+        --------
+            norm : numpy.array
+
+            Normalised state distribution. An array of shape
+            (players, opponents, 4) giving the proportion of the turns of
+            each match spent in each state, in the order of
+            `gamesimulator.action.STATES`.
+        """
+        totals = self.state_distribution.sum(axis=2, keepdims=True)
+        return np.where(totals > 0,
+                        self.state_distribution / np.where(totals > 0, totals, 1),
+                        0)
+
+    @property
+    def state_distribution_counters(self):
+        """
+        The state distribution as a list of lists of Counter objects,
+        mapping states to the number of times they occur for each player and
+        opponent.
+        """
+        return _counters(self.state_distribution)
+
+    @property
+    def normalised_state_distribution_counters(self):
+        """
+        The normalised state distribution as a list of lists of Counter
+        objects, mapping states to the proportion of the turns spent in them.
+        """
+        return _counters(self.normalised_state_distribution)
 
     @update_progress_bar
-    def _build_normalised_state_distribution(self):
+    def _build_normalised_state_to_action_distribution(self):
         """
         Returns:
         --------
-            norm : list
-
-            Normalised state distribution. A list of lists of counter objects:
-
-            Dictionary where the keys are the states and the values are a
-            normalized counts of the number of times that state occurs.
-        """
-        normalised_state_distribution = []
-        for player in self.state_distribution:
-            counters = []
-            for counter in player:
-                total = sum(counter.values())
-                counters.append(Counter({key: value / total for
-                                         key, value in counter.items()}))
-            normalised_state_distribution.append(counters)
-        return normalised_state_distribution
-
-    # @update_progress_bar
-#     def _build_state_to_action_distribution(self,
-#                                             state_to_action_distribution_series):
-#         state_to_action_key_map = {"AA to A count": ((A, A), A),
-#                                    "AA to B count": ((A, A), B),
-#                                    "AB to A count": ((A, B), A),
-#                                    "AB to B count": ((A, B), B),
-#                                    "BA to A count": ((B, A), A),
-#                                    "BA to B count": ((B, A), B),
-#                                    "BB to A count": ((B, B), A),
-#                                    "BB to B count": ((B, B), B)}
-#         state_to_action_distribution = [[
-#                 create_counter_dict(state_to_action_distribution_series,
-#                                     player_index,
-#                                     opponent_index,
-#                                     state_to_action_key_map)
-#                                  for opponent_index in range(self.num_players)]
-#                                 for player_index in range(self.num_players)]
-#         return state_to_action_distribution
-
-   #  @update_progress_bar
-#     def _build_normalised_state_to_action_distribution(self):
-#         """
-#         Returns:
-#         --------
-#             norm : list
-# 
-#             A list of lists of counter objects.
-# 
-#             Dictionary where the keys are the states and the values are a
-#             normalized counts of the number of times that state goes to a given
-#             action.
-#         """
-#         normalised_state_to_action_distribution = []
-#         for player in self.state_to_action_distribution:
-#             counters = []
-#             for counter in player:
-#                 norm_counter = Counter()
-#                 for state in [(A, A), (A, B), (B, A), (B, B)]:
-#                     total = counter[(state, A)] + counter[(state, B)]
-#                     if total > 0:
-#                         for action in [A, B]:
-#                             if counter[(state, action)] > 0:
-#                                 norm_counter[(state, action)] = counter[(state, action)] / total
-#                 counters.append(norm_counter)
-#             normalised_state_to_action_distribution.append(counters)
-#         return normalised_state_to_action_distribution
+            norm : numpy.array
+
+            Normalised state to action distribution. An array of shape
+            (players, opponents, 8) giving, for each state, the proportion of
+            the times the player went on to play each action, in the order of
+            `gamesimulator.interaction_utils.STATE_TO_ACTIONS`.
+        """
+        return iu.normalise_state_to_action_counts(
+            self.state_to_action_distribution)
 
+    @property
+    def state_to_action_distribution_counters(self):
+        """
+        The state to action distribution as a list of lists of Counter
+        objects, mapping state to action pairs to the number of times they
+        occur for each player and opponent.
+        """
+        return _counters(self.state_to_action_distribution,
+                         keys=iu.STATE_TO_ACTIONS)
+
+    @property
+    def normalised_state_to_action_distribution_counters(self):
+        """
+        The normalised state to action distribution as a list of lists of
+        Counter objects.
+        """
+        return _counters(self.normalised_state_to_action_distribution,
+                         keys=iu.STATE_TO_ACTIONS)
 
     @update_progress_bar
     def _build_ranking(self):
-        ranking = sorted(
-                range(self.num_players),
-                key=lambda i: -np.nanmedian(self.normalised_scores[i]))
+        medians = np.nanmedian(self.normalised_scores, axis=1)
+        ranking = sorted(range(self.num_players), key=lambda i: -medians[i])
         return ranking
 
     @update_progress_bar
@@ -321,8 +517,9 @@ class ResultSet():
         """
         Compute all dask tasks
         """
+        import dask as da
         if processes is None:
-            out = da.compute(*tasks, get=da.get)
+            out = da.compute(*tasks, scheduler="sync")
         else:
             out = da.compute(*tasks, num_workers=processes)
         return out
@@ -340,6 +537,8 @@ class ResultSet():
                    "AB count",
                    "BA count",
                    "BB count"]
+        columns += [column for column in CSV_STATE_TO_ACTION_COLUMNS
+                    if column in df.columns]
         sum_per_player_opponent_task = df.groupby(groups)[columns].sum()
 
         ignore_self_interactions_task = df["Player index"] != df["Opponent index"]
@@ -363,27 +562,86 @@ class ResultSet():
                 normalised_scores_task,
                 interactions_count_task)
 
+    def merge(self, other, progress_bar=False):
+        """
+        Combines two result sets into one holding the repetitions of both,
+        from the sums of their results rather than from file.
+
+        The players are those of this result set followed by those of
+        `other` that are not in it, players being matched by name (the n-th
+        player with a given name in `other` being the n-th with that name
+        here). Players that are only in one of the result sets have wins,
+        scores and normalised scores of NaN in the repetitions of the other,
+        which are left out of their medians and ranking.
+
+        Parameters
+        ----------
+            other : ResultSet
+                A result set built with the numpy backend
+            progress_bar : bool
+                Whether or not to create a progress bar
+
+        Returns
+        -------
+            gamesimulator.ResultSet
+        """
+        if self.accumulator is None or other.accumulator is None:
+            raise ValueError(
+                "Result sets built with the dask backend cannot be merged.")
+
+        players = list(self.players)
+        positions = _name_positions(players)
+        other_indices = []
+        for occurrence, name in _numbered(other.players):
+            if (name, occurrence) not in positions:
+                positions[name, occurrence] = len(players)
+                players.append(name)
+            other_indices.append(positions[name, occurrence])
+
+        score_dtype = np.result_type(self.accumulator.scores,
+                                     other.accumulator.scores)
+        accumulator = ResultAccumulator(
+            len(players), self.repetitions + other.repetitions,
+            score_dtype=score_dtype)
+        accumulator.present[:] = False
+        accumulator.insert(self.accumulator, range(self.num_players))
+        accumulator.insert(other.accumulator, other_indices,
+                           first_repetition=self.repetitions)
+        return ResultSet(filename=None, players=players,
+                         repetitions=accumulator.repetitions,
+                         progress_bar=progress_bar, accumulator=accumulator)
+
+    __add__ = merge
+
     def __eq__(self, other):
         """
         Check equality of results set
 
+        Normalised scores are compared to within rounding, as those of the
+        numpy and dask backends are summed differently.
+
         Parameters
         ----------
 
             other : axelrod.ResultSet
                 Another results set against which to check equality
         """
-        return all([self.wins == other.wins,
-                    self.match_lengths == other.match_lengths,
-                    self.scores == other.scores,
-                    self.normalised_scores == other.normalised_scores,
+        return all([_equal_with_nan(self.wins, other.wins),
+                    np.array_equal(self.match_lengths, other.match_lengths),
+                    _equal_with_nan(self.scores, other.scores),
+                    self.normalised_scores.shape ==
+                    other.normalised_scores.shape,
+                    np.allclose(self.normalised_scores,
+                                other.normalised_scores,
+                                rtol=1e-12, atol=1e-12, equal_nan=True),
                     self.ranking == other.ranking,
                     self.ranked_names == other.ranked_names,
-                    #self.payoffs == other.payoffs,
-                    #self.payoff_matrix == other.payoff_matrix,
-                    #self.payoff_stddevs == other.payoff_stddevs,
-                    self.score_diffs == other.score_diffs])
-                    #self.payoff_diffs_means == other.payoff_diffs_means])
+                    np.array_equal(self.payoffs, other.payoffs),
+                    np.array_equal(self.payoff_matrix, other.payoff_matrix),
+                    np.array_equal(self.payoff_stddevs, other.payoff_stddevs),
+                    np.array_equal(self.score_diffs, other.score_diffs),
+                    np.array_equal(self.payoff_diffs_means,
+                                   other.payoff_diffs_means)])
 
     def __ne__(self, other):
         """
@@ -412,46 +670,36 @@ class ResultSet():
 
         """
 
-        median_scores = map(np.nanmedian, self.normalised_scores)
-        median_wins = map(np.nanmedian, self.wins)
+        median_scores = np.nanmedian(self.normalised_scores, axis=1).tolist()
+        median_wins = np.nanmedian(self.wins, axis=1).tolist()
 
         self.player = namedtuple("Player", ["Rank", "Name", "Median_score", 
         									"Wins", "AA_rate",
-                                            "AB_rate", "BA_rate", "BB_rate"])
-
-        states = [(A, A), (A, B), (B, A), (B, B)]
-        state_prob = []
-        for i, player in enumerate(self.normalised_state_distribution):
-            counts = []
-            for state in states:
-                p = sum([opp[state] for j, opp in enumerate(player) if i != j])
-                counts.append(p)
-            try:
-                counts = [c / sum(counts) for c in counts]
-            except ZeroDivisionError:
-                counts = [0 for c in counts]
-            state_prob.append(counts)
-
-        # state_to_A_prob = []
-#         for player in self.normalised_state_to_action_distribution:
-#             rates = []
-#             for state in states:
-#                 counts = [counter[(state, A)] for counter in player
-#                           if counter[(state, A)] > 0]
-# 
-#                 if len(counts) > 0:
-#                     rate = np.mean(counts)
-#                 else:
-#                     rate = 0
-# 
-#                 rates.append(rate)
-#             state_to_A_prob.append(rates)
+                                            "AB_rate", "BA_rate", "BB_rate",
+                                            "AA_to_A_rate", "AB_to_A_rate",
+                                            "BA_to_A_rate", "BB_to_A_rate"])
+
+        # The normalised state distribution of self interactions is 0
+        counts = self.normalised_state_distribution.sum(axis=1)
+        totals = counts.sum(axis=1, keepdims=True)
+        state_prob = np.where(totals > 0,
+                              counts / np.where(totals > 0, totals, 1),
+                              0).tolist()
+
+        # The mean over opponents of the rate of playing A after each state,
+        # leaving out opponents against which the rate is 0
+        rates = self.normalised_state_to_action_distribution[:, :, 0::2]
+        positive = rates > 0
+        number = positive.sum(axis=1)
+        state_to_A_prob = np.where(
+            number > 0, rates.sum(axis=1) / np.where(number > 0, number, 1),
+            0).tolist()
 
         summary_measures = list(zip(self.players, median_scores, median_wins))
 
         summary_data = []
         for rank, i in enumerate(self.ranking):
-            data = list(summary_measures[i]) + state_prob[i] 
+            data = list(summary_measures[i]) + state_prob[i] + state_to_A_prob[i]
             summary_data.append(self.player(rank, *data))
 
         return summary_data
@@ -475,29 +723,73 @@ class ResultSet():
                 writer.writerow(player)
 
 
-def create_counter_dict(df, player_index, opponent_index, key_map):
+def merge_results(filenames, players, repetitions, game=None,
+                  progress_bar=True):
     """
-    Create a Counter object mapping states (corresponding to columns of df) for
-    players given by player_index, opponent_index. Renaming the variables with
-    `key_map`. Used by `ResultSet._reshape_out`
+    Combines the files written by the shards of a tournament (see
+    `gamesimulator.Tournament`) into a single ResultSet.
 
     Parameters
     ----------
-        df : a multiindex pandas df
-        player_index: int
-        opponent_index: int
-        key_map : a dict
-            maps cols of df to strings
+        filenames : list
+            The CSV files or binary interaction logs written by the shards,
+            with results
+        players : list
+            The names of the players of the whole tournament
+        repetitions : int
+            The number of repetitions of each match
+        game : gamesimulator.Game
+            The game of the tournament, which sets the type of the scores
+        progress_bar : bool
+            Whether or not to create a progress bar
 
     Returns
     -------
-        A counter dictionary
+        gamesimulator.ResultSet
     """
-    counter = Counter()
-    if player_index != opponent_index:
-        if (player_index, opponent_index) in df.index:
-            for key, value in df.loc[player_index, opponent_index].items():
-                if value > 0:
-                    counter[key_map[key]] = value
-    return counter
-
+    if game is None:
+        game = Game()
+    accumulator = ResultAccumulator(len(players), repetitions,
+                                    score_dtype=game.payoff_array.dtype)
+    for filename in filenames:
+        accumulator.add_file(filename)
+    return ResultSet(filename=None, players=players, repetitions=repetitions,
+                     progress_bar=progress_bar, accumulator=accumulator)
+
+
+def _equal_with_nan(array_1, array_2):
+    """Whether two arrays are equal, NaN being equal to NaN, as
+    `np.array_equal(..., equal_nan=True)` from numpy 1.19."""
+    array_1 = np.asarray(array_1, dtype=float)
+    array_2 = np.asarray(array_2, dtype=float)
+    if array_1.shape != array_2.shape:
+        return False
+    return bool(((array_1 == array_2) |
+                 (np.isnan(array_1) & np.isnan(array_2))).all())
+
+
+def _numbered(names):
+    """Yields (occurrence, name) for a list of names, counting earlier
+    occurrences of the same name."""
+    seen = Counter()  # type: Counter
+    for name in names:
+        yield seen[name], name
+        seen[name] += 1
+
+
+def _name_positions(names):
+    """Maps (name, occurrence) to positions in a list of names."""
+    return {(name, occurrence): position
+            for position, (occurrence, name) in enumerate(_numbered(names))}
+
+
+def _counters(distribution, keys=STATES):
+    """
+    Converts an array of shape (players, opponents, len(keys)) of values for
+    each key, by default each state, into a list of lists of Counter objects,
+    leaving out keys with a value of 0.
+    """
+    return [[Counter({key: value for key, value in zip(keys, values)
+                      if value > 0})
+             for values in player]
+            for player in distribution.tolist()]
@@ -0,0 +1,149 @@
+"""
+Cost-aware scheduling of the chunks of a parallel tournament.
+
+A `CostModel` estimates the time each player takes per turn, either from a
+short calibration match of every player against itself or from the timings
+of earlier tournaments saved to a JSON file. A match between two players is
+estimated to cost the sum of their costs per turn times its number of turns
+and repetitions.
+
+`schedule_tasks` then splits the most costly chunks into ranges of
+repetitions and orders the resulting tasks longest first, so that parallel
+workers finish at about the same time.
+"""
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+from gamesimulator.match import Match
+
+
+class CostModel(object):
+    """The estimated time taken by players per turn, keyed by player name."""
+
+    def __init__(self, costs=None):
+        """
+        Parameters
+        ----------
+            costs : dict
+                Mapping player names to seconds per turn
+        """
+        self.costs = dict(costs) if costs else {}
+
+    @classmethod
+    def load(cls, filename):
+        """Reads a cost model saved with `save`, or returns an empty one if
+        the file does not exist."""
+        if not os.path.exists(filename):
+            return cls()
+        with open(filename, 'r') as file_obj:
+            return cls(json.load(file_obj))
+
+    def save(self, filename):
+        """Writes the costs to a JSON file."""
+        with open(filename, 'w') as file_obj:
+            json.dump(self.costs, file_obj, indent=1, sort_keys=True)
+
+    def calibrate(self, players, turns=20):
+        """
+        Estimates the cost of every player without one by timing a short
+        match against a clone of itself.
+
+        Parameters
+        ----------
+            players : list
+                A list of gamesimulator.Player objects
+            turns : int
+                The number of turns of each calibration match
+        """
+        for player in players:
+            name = str(player)
+            if name in self.costs:
+                continue
+            match = Match((player.clone(), player.clone()), turns=turns)
+            start = time.perf_counter()
+            match.play()
+            elapsed = time.perf_counter() - start
+            self.costs[name] = elapsed / (2 * turns)
+
+    def update(self, timings):
+        """
+        Updates the costs of the players from measured timings of matches,
+        solving for the cost of each player in the least squares sense.
+
+        Parameters
+        ----------
+            timings : list
+                Tuples (player name, opponent name, turns, seconds)
+        """
+        timings = [timing for timing in timings if timing[2] > 0]
+        if not timings:
+            return
+        names = sorted({name for timing in timings for name in timing[:2]})
+        column = {name: index for index, name in enumerate(names)}
+        design = np.zeros((len(timings), len(names)))
+        observed = np.zeros(len(timings))
+        for row, (name, opponent, turns, seconds) in enumerate(timings):
+            design[row, column[name]] += 1
+            design[row, column[opponent]] += 1
+            observed[row] = seconds / turns
+        costs, _, _, _ = np.linalg.lstsq(design, observed, rcond=None)
+        for name, cost in zip(names, costs):
+            self.costs[name] = max(float(cost), 0.0)
+
+    def match_cost(self, player, opponent, turns, repetitions=1):
+        """
+        The estimated time taken by the repetitions of a match. Players
+        without a cost are given the mean cost of the others.
+        """
+        default = (sum(self.costs.values()) / len(self.costs)
+                   if self.costs else 1.0)
+        per_turn = (self.costs.get(str(player), default) +
+                    self.costs.get(str(opponent), default))
+        return per_turn * turns * repetitions
+
+
+def schedule_tasks(chunks, costs, workers, parts_per_worker=4):
+    """
+    Splits and orders chunks of matches for parallel workers.
+
+    Chunks costing more than the total cost divided by
+    `workers * parts_per_worker` are split into ranges of repetitions of
+    about that cost. The tasks are then ordered from the most to the least
+    costly, ties in their original order.
+
+    Parameters
+    ----------
+        chunks : list
+            Tuples (chunk index, chunk) as yielded by
+            `Tournament._remaining_chunks`
+        costs : list
+            The estimated cost of each chunk
+        workers : int
+            The number of parallel workers
+        parts_per_worker : int
+            The number of tasks per worker aimed for when splitting chunks
+
+    Returns
+    -------
+    list
+        Tuples (chunk index, chunk, first repetition, last repetition + 1)
+    """
+    total = sum(costs)
+    target = total / (workers * parts_per_worker) if total > 0 else 0
+    tasks = []
+    task_costs = []
+    for (chunk_index, chunk), cost in zip(chunks, costs):
+        repetitions = chunk[2]
+        parts = 1
+        if target > 0 and cost > target:
+            parts = min(repetitions, int(math.ceil(cost / target)))
+        bounds = [repetitions * part // parts for part in range(parts + 1)]
+        for start, stop in zip(bounds, bounds[1:]):
+            tasks.append((chunk_index, chunk, start, stop))
+            task_costs.append(cost * (stop - start) / repetitions)
+    order = sorted(range(len(tasks)), key=lambda i: -task_costs[i])
+    return [tasks[i] for i in order]
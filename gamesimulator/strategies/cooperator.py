@@ -16,7 +16,14 @@ class Cooperator(Player):
 
     name = 'Cooperator'
 
+    classifier = {
+        'memory_depth': 0,
+        'stochastic': False
+    }
 
     @staticmethod
     def strategy(opponent: Player) -> Action:
-        return A
\ No newline at end of file
+        return A
+
+    def memory_one_table(self):
+        return (1, (1, 1, 1, 1))
\ No newline at end of file
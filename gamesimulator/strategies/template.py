@@ -16,7 +16,14 @@ class Template(Player):
 
     name = 'Template'
 
+    classifier = {
+        'memory_depth': 0,
+        'stochastic': False
+    }
 
     @staticmethod
     def strategy(opponent: Player) -> Action:
-        return B
\ No newline at end of file
+        return B
+
+    def memory_one_table(self):
+        return (0, (0, 0, 0, 0))
\ No newline at end of file
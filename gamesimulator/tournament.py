@@ -1,10 +1,13 @@
-from collections import defaultdict
+from collections import defaultdict, deque
 import csv
+import json
 import logging
 from multiprocessing import Process, Queue, cpu_count
-from tempfile import mkstemp
-import warnings
 import os
+import pickle
+import time
+import traceback
+import warnings
 
 import tqdm
 
@@ -13,22 +16,36 @@ from gamesimulator.player import Player
 from gamesimulator.action import actions_to_str
 from .game import Game
 from .match import Match
+from .history import Interactions
+from .interaction_log import InteractionLogWriter
+from .bulk_match import (memory_one_tables, play_memory_one_matches,
+                         actions_to_interactions)
+from .match_cache import MatchCache, player_fingerprint
 from .match_generator import MatchGenerator
-from .result_set import ResultSet
+from .random_ import repetition_seed
+from .scheduling import CostModel, schedule_tasks
+from .result_set import ResultAccumulator, ResultSet
 from gamesimulator.action import Action, str_to_actions
 
 import gamesimulator.interaction_utils as iu
 
 A, B = Action.A, Action.B
 
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, TextIO
 
 
 class Tournament(object):
 
     def __init__(self, players: List[Player],
                  name: str = 'gamesimulator', game: Game = None, turns: int = None,
-                 repetitions: int = 10, match_attributes: dict = None) -> None:
+                 repetitions: int = 10, match_attributes: dict = None,
+                 fast_forward: bool = False,
+                 compact_history: bool = False,
+                 match_accounting: bool = False,
+                 cache_directory: Optional[str] = None,
+                 seed: Optional[int] = None,
+                 shard_index: int = 0,
+                 num_shards: int = 1) -> None:
         """
         Parameters
         ----------
@@ -46,6 +63,42 @@ class Tournament(object):
             Mapping attribute names to values which should be passed to players.
             The default is to use the correct values for turns and game
             but these can be overridden if desired.
+        fast_forward : bool
+            Whether or not matches between deterministic players are only
+            played once per pair and stop playing once the players reach a
+            cycle of joint actions (see `Match`).
+        compact_history : bool
+            Whether or not players store their histories as
+            `gamesimulator.history.History` objects (see `Match`).
+        match_accounting : bool
+            Whether or not only the players' histories are updated as matches
+            are played, their action counts and state distributions being
+            derived from them when read (see `Match`).
+        cache_directory : string
+            A directory in which to cache the interactions of every match.
+            Matches between players whose class source, parameters, game and
+            number of turns and repetitions are unchanged since they were
+            cached are not replayed (see `gamesimulator.match_cache`). With a
+            seed, matches are only reused by players in the same positions,
+            played in bulk or not as when they were cached.
+        seed : int
+            If given, every repetition of every match gets its own random
+            stream, derived from this seed and its position in the tournament,
+            so that results do not depend on the order in which matches are
+            played or on the number of processes. Matches played in bulk (see
+            `play`) draw from their own generator (see
+            `gamesimulator.random_.repetition_generator`), other matches seed
+            the global random state before every repetition (see
+            `gamesimulator.random_.repetition_seed`).
+        shard_index : int
+            The index of the shard of the tournament to play, from 0 to
+            `num_shards` - 1
+        num_shards : int
+            The number of shards the tournament is split into. Each shard
+            plays a deterministic, balanced share of the matches (see
+            `MatchGenerator`) and can be run as a separate Tournament, for
+            instance on another machine. The files written by the shards can
+            then be combined with `gamesimulator.result_set.merge_results`.
         """
         if game is None:
             self.game = Game()
@@ -55,6 +108,7 @@ class Tournament(object):
         self.num_interactions = 0
         self.players = players
         self.repetitions = repetitions
+        self.seed = seed
 
         if turns is None:
             turns = DEFAULT_TURNS
@@ -63,26 +117,53 @@ class Tournament(object):
         self.match_generator = MatchGenerator(players=players, turns=turns,
                                               game=self.game,
                                               repetitions=self.repetitions,
-                                              match_attributes=match_attributes)
+                                              match_attributes=match_attributes,
+                                              fast_forward=fast_forward,
+                                              compact_history=compact_history,
+                                              match_accounting=match_accounting,
+                                              shard_index=shard_index,
+                                              num_shards=num_shards)
         self._logger = logging.getLogger(__name__)
 
+        self.match_cache = None  # type: Optional[MatchCache]
+        self._fingerprints = []  # type: List[Optional[str]]
+        if cache_directory is not None:
+            self.match_cache = MatchCache(cache_directory)
+            self._fingerprints = [player_fingerprint(player)
+                                  for player in players]
+
         self.use_progress_bar = True
         self.filename = None  # type: Optional[str]
-        self._temp_file_descriptor = None  # type: Optional[int]
+        self.file_format = 'csv'
+        self._bulk_actions = {}  # type: dict
+        self._bulk_players = set()  # type: set
+        self._accumulator = None  # type: Optional[ResultAccumulator]
+        self._checkpoint_file = None  # type: Optional[TextIO]
+        self._completed_chunks = set()  # type: set
+        self._append = False
+        self._cost_model = None  # type: Optional[CostModel]
+        self._timings = []  # type: List[Tuple[str, str, int, float]]
+
+    def __getstate__(self):
+        """Leaves out the open checkpoint file, which only the parent process
+        writes to, so that the tournament can be pickled for workers started
+        with the 'spawn' method."""
+        state = self.__dict__.copy()
+        state['_checkpoint_file'] = None
+        return state
 
     def setup_output(self, filename=None):
-        """assign/create `filename` to `self`. If file should be deleted once
-        `play` is finished, assign a file descriptor. """
-        temp_file_descriptor = None
-        if filename is None:
-            temp_file_descriptor, filename = mkstemp()
-
+        """assign `filename` to `self`. If it is None the interactions are
+        not written to file and results are only accumulated in memory."""
         self.filename = filename
-        self._temp_file_descriptor = temp_file_descriptor
 
 
     def play(self, build_results: bool = True, filename: str = None,
-              progress_bar: bool = True) -> ResultSet:
+             processes: Optional[int] = None, progress_bar: bool = True,
+             vectorise: bool = False, file_format: str = 'csv',
+             checkpoint: bool = False, resume: bool = False,
+             schedule: bool = False,
+             timing_history: Optional[str] = None) -> ResultSet:
         """
         Plays the tournament and passes the results to the ResultSet class
 
@@ -93,66 +174,473 @@ class Tournament(object):
         filename : string
             name of output file
         processes : integer
-            The number of processes to be used for parallel processing
+            The number of processes to be used for parallel processing. If
+            None the matches are played in serial, if 0 one process per
+            available cpu is used.
         progress_bar : bool
             Whether or not to create a progress bar which will be updated
+        vectorise : bool
+            Whether or not to play all matches between players that have a
+            memory-one table (see `Player.memory_one_table`) at once using
+            `gamesimulator.bulk_match`.
+        file_format : string
+            The format of the output file: 'csv' or 'binary' for the compact
+            format of `gamesimulator.interaction_log`.
+        checkpoint : bool
+            Whether or not to record each chunk of matches as it is written
+            to `filename`, in `filename` + '.checkpoint', so that an
+            interrupted tournament can be resumed.
+        resume : bool
+            Whether or not to resume from the checkpoint of an earlier run
+            writing to `filename`, skipping the chunks it completed. Implies
+            checkpoint.
+        schedule : bool
+            Whether or not a parallel run splits and orders its chunks by
+            their estimated cost, most costly first, so that the workers
+            finish together (see `gamesimulator.scheduling`). Costs are read
+            from `timing_history` or measured by a short calibration match of
+            each player against itself. The output is unchanged. Matches
+            whose repetitions are split between workers are not written to
+            the match cache, which only holds complete matches, so with a
+            `cache_directory` the most costly matches are not cached.
+        timing_history : string
+            A JSON file of the costs of players measured by earlier
+            tournaments, used by `schedule` and updated with the timings of
+            the matches played by this tournament. Matches read from the
+            match cache or played in bulk are not timed.
 
         Returns
         -------
         gamesimulator.ResultSet
         """
+        self._start_play(build_results=build_results, filename=filename,
+                         progress_bar=progress_bar, file_format=file_format,
+                         checkpoint=checkpoint, resume=resume)
+
+        if vectorise:
+            self._bulk_actions = self._play_bulk_matches()
+
+        self._cost_model = None
+        self._timings = []
+        if timing_history is not None:
+            self._cost_model = CostModel.load(timing_history)
+        if schedule:
+            if self._cost_model is None:
+                self._cost_model = CostModel()
+            self._cost_model.calibrate(self.players)
+
+        if processes is None:
+            self._run_serial(build_results=build_results)
+        else:
+            self._run_parallel(build_results=build_results,
+                               processes=processes, schedule=schedule)
+
+        if timing_history is not None and self._cost_model is not None:
+            self._cost_model.update(self._timings)
+            self._cost_model.save(timing_history)
+
+        return self._finish_play(build_results=build_results,
+                                 progress_bar=progress_bar)
+
+    def _start_play(self, build_results: bool = True,
+                    filename: Optional[str] = None,
+                    progress_bar: bool = True, file_format: str = 'csv',
+                    checkpoint: bool = False, resume: bool = False) -> None:
+        """Sets up the output, checkpoint and accumulator of a run (see
+        `play`)."""
         self.num_interactions = 0
 
         self.use_progress_bar = progress_bar
 
+        if file_format not in ('csv', 'binary'):
+            raise ValueError("file_format must be 'csv' or 'binary'.")
+        self.file_format = file_format
         self.setup_output(filename)
 
+        if resume and filename is None:
+            raise ValueError("A filename is required to resume a tournament.")
+        self._completed_chunks = set()
+        self._append = False
+        if checkpoint or resume:
+            self._open_checkpoint(build_results=build_results, resume=resume)
+
         if not build_results and not filename:
             warnings.warn(
                 "Tournament results will not be accessible since "
                 "build_results=False and no filename was supplied.")
 
-        self._run_serial(build_results=build_results)
+        if build_results:
+            self._accumulator = ResultAccumulator(
+                num_players=len(self.players), repetitions=self.repetitions,
+                score_dtype=self.game.payoff_array.dtype)
+
+    def _finish_play(self, build_results: bool = True,
+                     progress_bar: bool = True) -> Optional[ResultSet]:
+        """Closes the checkpoint of a run and builds its ResultSet (see
+        `play`)."""
+        _close_objects(self._checkpoint_file)
+        self._checkpoint_file = None
 
         result_set = None
         if build_results:
+            # Matches played before resuming are only in the file
+            if self._append:
+                self._accumulator = None
             result_set = ResultSet(filename=self.filename,
                                    players=[str(p) for p in self.players],
                                    repetitions=self.repetitions,
-                                   progress_bar=progress_bar)
-        if self._temp_file_descriptor is not None:
-            assert self.filename is not None
-            os.close(self._temp_file_descriptor)
-            os.remove(self.filename)
+                                   progress_bar=progress_bar,
+                                   accumulator=self._accumulator)
+        self._accumulator = None
+        self._bulk_actions = {}
+        self._bulk_players = set()
 
         return result_set
 
+    def _play_bulk_matches(self) -> dict:
+        """
+        Plays every match between players with a memory-one table at once.
+
+        Returns
+        -------
+        A dictionary mapping index pairs to the actions of both players, as
+        returned by `gamesimulator.bulk_match.play_memory_one_matches`.
+        """
+        tables = memory_one_tables(self.players)
+        self._bulk_players = set(tables)
+        index_pairs = [index_pair for _, (index_pair, _, _)
+                       in self._remaining_chunks()
+                       if self._is_bulk(index_pair) and
+                       not self._is_cached(index_pair)]
+        return play_memory_one_matches(tables, index_pairs, self.turns,
+                                       self.repetitions, seed=self.seed)
+
+
+    def _remaining_chunks(self):
+        """
+        A generator of the chunks of `MatchGenerator.build_match_chunks`, with
+        their position, that were not completed before resuming.
+
+        Yields
+        ------
+        tuples
+            (chunk index, chunk)
+        """
+        chunks = self.match_generator.build_match_chunks()
+        for chunk_index, chunk in enumerate(chunks):
+            if chunk_index not in self._completed_chunks:
+                yield chunk_index, chunk
+
+    def _checkpoint_header(self, build_results: bool = True) -> str:
+        """Returns a description of the tournament, used to check that a
+        checkpoint belongs to it."""
+        header = {"players": [str(p) for p in self.players],
+                  "turns": self.turns,
+                  "repetitions": self.repetitions,
+                  "build_results": build_results,
+                  "file_format": self.file_format}
+        if self.seed is not None:
+            header["seed"] = self.seed
+        if self.match_generator.num_shards > 1:
+            header["shard"] = [self.match_generator.shard_index,
+                               self.match_generator.num_shards]
+        return json.dumps(header, sort_keys=True)
+
+    def _open_checkpoint(self, build_results: bool = True,
+                         resume: bool = False) -> None:
+        """
+        Opens the checkpoint file of `self.filename`.
+
+        The first line of a checkpoint describes the tournament. Each
+        following line records a completed chunk: its index, the size of the
+        output file once it was written and the number of interactions
+        written so far. When resuming, the output file is truncated to the
+        last recorded size, discarding anything written after the last
+        complete chunk, and completed chunks are skipped.
+        """
+        assert self.filename is not None
+        header = self._checkpoint_header(build_results)
+        checkpoint_filename = self.filename + '.checkpoint'
+        entries = []  # type: List[Tuple[int, int, int]]
+
+        if resume and os.path.exists(checkpoint_filename):
+            with open(checkpoint_filename, 'r') as checkpoint_file:
+                lines = checkpoint_file.read().split('\n')
+            if lines[0] != header:
+                raise ValueError("{} does not belong to this tournament.".format(
+                    checkpoint_filename))
+            # The last line was not terminated if the run was interrupted
+            # while writing it.
+            for line in lines[1:-1]:
+                chunk_index, offset, num_interactions = map(int, line.split())
+                entries.append((chunk_index, offset, num_interactions))
+
+        if entries:
+            _, offset, self.num_interactions = entries[-1]
+            with open(self.filename, 'r+b') as out_file:
+                out_file.truncate(offset)
+            self._completed_chunks = {entry[0] for entry in entries}
+            self._append = True
+
+        checkpoint_file = open(checkpoint_filename, 'w')
+        checkpoint_file.write(header + '\n')
+        for entry in entries:
+            checkpoint_file.write('{} {} {}\n'.format(*entry))
+        checkpoint_file.flush()
+        self._checkpoint_file = checkpoint_file
+
+    def _record_chunk(self, chunk_index: int, out_file, writer) -> None:
+        """Flushes the output and records a completed chunk in the checkpoint,
+        if there is one."""
+        if self._checkpoint_file is None:
+            return
+        if hasattr(writer, 'flush'):
+            writer.flush()
+        out_file.flush()
+        os.fsync(out_file.fileno())
+        self._checkpoint_file.write('{} {} {}\n'.format(
+            chunk_index, out_file.tell(), self.num_interactions))
+        self._checkpoint_file.flush()
+        os.fsync(self._checkpoint_file.fileno())
 
     def _run_serial(self, build_results: bool=True) -> bool:
         """Run all matches in serial."""
 
-        chunks = self.match_generator.build_match_chunks()
+        chunks = self._remaining_chunks()
 
         out_file, writer = self._get_file_objects(build_results)
         progress_bar = self._get_progress_bar()
 
-        for chunk in chunks:
+        for chunk_index, chunk in chunks:
+            played = self._is_played(chunk[0])
+            start = time.perf_counter()
             results = self._play_matches(chunk, build_results=build_results)
+            if played:
+                self._record_timing(chunk[0], chunk[2],
+                                    time.perf_counter() - start)
             self._write_interactions_to_file(results, writer=writer)
+            self._record_chunk(chunk_index, out_file, writer)
 
             if self.use_progress_bar:
                 progress_bar.update(1)
 
-        _close_objects(out_file, progress_bar)
+        _close_objects(writer, out_file, progress_bar)
+
+        return True
+
+    def _run_parallel(self, processes: int = 2,
+                      build_results: bool = True,
+                      schedule: bool = False) -> bool:
+        """
+        Run all matches in parallel
+
+        Parameters
+        ----------
+        build_results : bool
+            whether or not to build a results set
+        processes : int
+            How many processes to use.
+        schedule : bool
+            Whether or not to split and order the chunks by their estimated
+            cost (see `gamesimulator.scheduling`).
+        """
+        # At first sight, it might seem simpler to use the multiprocessing Pool
+        # Class rather than Processes and Queues. However, Pool can only accept
+        # target functions which can be pickled and instance methods cannot.
+        work_queue = Queue()  # type: Queue
+        done_queue = Queue()  # type: Queue
+        workers = self._n_workers(processes=processes)
+
+        chunks = list(self._remaining_chunks())
+        if schedule and self._cost_model is not None:
+            costs = [self._cost_model.match_cost(
+                self.players[chunk[0][0]], self.players[chunk[0][1]],
+                self.turns, chunk[2]) for _, chunk in chunks]
+            tasks = schedule_tasks(chunks, costs, workers)
+        else:
+            tasks = [(chunk_index, chunk, 0, chunk[2])
+                     for chunk_index, chunk in chunks]
+        for task in tasks:
+            work_queue.put(task)
+
+        # Tasks are written in the order of their chunks and repetitions,
+        # whatever the order they were played in.
+        written = sorted((chunk_index, start, stop)
+                         for chunk_index, _, start, stop in tasks)
+        started = self._start_workers(workers, work_queue, done_queue,
+                                      build_results)
+        try:
+            self._process_done_queue(workers, done_queue, build_results,
+                                     written)
+        except BaseException:
+            for process in started:
+                process.terminate()
+            raise
+        finally:
+            for process in started:
+                process.join()
 
         return True
 
+    def _n_workers(self, processes: int = 2) -> int:
+        """
+        Determines the number of parallel processes to use.
+
+        Returns
+        -------
+        integer
+        """
+        if 1 <= processes <= cpu_count():
+            n_workers = processes
+        else:
+            n_workers = cpu_count()
+        return n_workers
+
+    def _start_workers(self, workers: int, work_queue: Queue,
+                       done_queue: Queue,
+                       build_results: bool = True) -> List[Process]:
+        """
+        Initiates the sub-processes to carry out parallel processing.
+
+        Parameters
+        ----------
+        workers : integer
+            The number of sub-processes to create
+        work_queue : multiprocessing.Queue
+            A queue containing an entry for each round robin to be processed
+        done_queue : multiprocessing.Queue
+            A queue containing the output dictionaries from each round robin
+        build_results : bool
+            whether or not to build a results set
+
+        Returns
+        -------
+        list
+            The started processes
+        """
+        processes = []
+        for _ in range(workers):
+            process = Process(target=self._worker,
+                              args=(work_queue, done_queue, build_results))
+            work_queue.put('STOP')
+            process.start()
+            processes.append(process)
+        return processes
+
+    def _process_done_queue(self, workers: int, done_queue: Queue,
+                            build_results: bool = True,
+                            tasks: Optional[List[Tuple[int, int, int]]] = None
+                            ) -> bool:
+        """
+        Retrieves the matches from the parallel sub-processes and writes them
+        to file.
+
+        Results arrive in whatever order the workers finish them. They are
+        held back until every earlier chunk, and every earlier repetition of
+        the same chunk, has been written so that the output is identical to
+        that of a serial run.
+
+        If a worker fails, the exception it raised is raised again here, with
+        the worker's traceback as its cause.
+
+        Parameters
+        ----------
+        workers : integer
+            The number of sub-processes in existence
+        done_queue : multiprocessing.Queue
+            A queue containing the output dictionaries from each round robin
+        build_results : bool
+            whether or not to build a results set
+        tasks : list
+            Tuples (chunk index, first repetition, last repetition + 1) of
+            the work given to the workers, in the order in which it is to be
+            written
+        """
+        out_file, writer = self._get_file_objects(build_results)
+        progress_bar = self._get_progress_bar()
+
+        if tasks is None:
+            tasks = [(chunk_index, 0, self.repetitions)
+                     for chunk_index in range(len(self.match_generator))]
+        expected = deque(tasks)
+        pending = {}
+        stops = 0
+        try:
+            while stops < workers:
+                item = done_queue.get()
+                if item == 'STOP':
+                    stops += 1
+                    continue
+
+                chunk_index, start, results = item
+                if chunk_index == 'ERROR':
+                    error, remote_traceback = start, results
+                    raise error from _RemoteTraceback(remote_traceback)
+                pending[chunk_index, start] = results
+                while expected and expected[0][:2] in pending:
+                    chunk_index, start, stop = expected.popleft()
+                    results, elapsed = pending.pop((chunk_index, start))
+                    if elapsed is not None:
+                        for index_pair in results:
+                            self._record_timing(index_pair, stop - start,
+                                                elapsed)
+                    self._write_interactions_to_file(results, writer=writer,
+                                                     first_repetition=start)
+                    if stop == self.repetitions:
+                        self._record_chunk(chunk_index, out_file, writer)
+                        if self.use_progress_bar:
+                            progress_bar.update(1)
+        finally:
+            _close_objects(writer, out_file, progress_bar)
+        return True
+
+    def _worker(self, work_queue: Queue, done_queue: Queue,
+                build_results: bool = True) -> bool:
+        """
+        The work for each parallel sub-process to execute.
+
+        Parameters
+        ----------
+        work_queue : multiprocessing.Queue
+            A queue containing an entry for each round robin to be processed
+        done_queue : multiprocessing.Queue
+            A queue containing the output dictionaries from each round robin
+        build_results : bool
+            whether or not to build a results set
+
+        An exception raised while playing is sent to the parent process as
+        ('ERROR', exception, formatted traceback) and the worker stops.
+        """
+        try:
+            for chunk_index, chunk, start, stop in iter(work_queue.get,
+                                                        'STOP'):
+                played = self._is_played(chunk[0])
+                began = time.perf_counter()
+                interactions = self._play_matches(chunk, build_results,
+                                                  repetitions=(start, stop))
+                elapsed = time.perf_counter() - began if played else None
+                done_queue.put((chunk_index, start, (interactions, elapsed)))
+        except Exception as error:
+            done_queue.put(('ERROR', _picklable(error),
+                            traceback.format_exc()))
+            return False
+        done_queue.put('STOP')
+        return True
+
     def _get_file_objects(self, build_results=True):
         """Returns the file object and writer for writing results or
         (None, None) if self.filename is None"""
         file_obj = None
         writer = None
-        if self.filename is not None:
+        if self.filename is not None and self.file_format == 'binary':
+            file_obj = open(self.filename, 'ab' if self._append else 'wb')
+            writer = InteractionLogWriter(
+                file_obj, players=[str(p) for p in self.players],
+                build_results=build_results)
+        elif self.filename is not None and self._append:
+            file_obj = open(self.filename, 'a')
+            writer = csv.writer(file_obj, lineterminator='\n')
+        elif self.filename is not None:
             file_obj = open(self.filename, 'w')
             writer = csv.writer(file_obj, lineterminator='\n')
 
@@ -173,21 +661,41 @@ class Tournament(object):
                                "AA count",
                                "AB count",
                                "BA count",
-                               "BB count"])
+                               "BB count",
+                               "AA to A count",
+                               "AA to B count",
+                               "AB to A count",
+                               "AB to B count",
+                               "BA to A count",
+                               "BA to B count",
+                               "BB to A count",
+                               "BB to B count"])
 
             writer.writerow(header)
         return file_obj, writer
 
+    def _record_timing(self, index_pair, repetitions, seconds):
+        """Records the time taken by repetitions of a match, if a timing
+        history is kept."""
+        if self._cost_model is None:
+            return
+        player, opponent = (str(self.players[index]) for index in index_pair)
+        self._timings.append((player, opponent, self.turns * repetitions,
+                              seconds))
+
     def _get_progress_bar(self):
         if self.use_progress_bar:
             return tqdm.tqdm(total=self.match_generator.size,
+                             initial=len(self._completed_chunks),
                              desc="Playing matches")
         return None
 
-    def _write_interactions_to_file(self, results, writer):
-        """Write the interactions to csv."""
+    def _write_interactions_to_file(self, results, writer, first_repetition=0):
+        """Write the interactions to csv, if there is a writer, and add their
+        results to the accumulator. The interactions of each pair start at
+        repetition `first_repetition`."""
         for index_pair, interactions in results.items():
-            repetition = 0
+            repetition = first_repetition
             for interaction, results in interactions:
 
                 if results is not None:
@@ -195,7 +703,8 @@ class Tournament(object):
                      score_diffs,
                      turns, score_per_turns,
                      score_diffs_per_turns,
-                     state_distribution,
+                     state_counts,
+                     state_to_action_counts,
                      winner_index) = results
                 for index, player_index in enumerate(index_pair):
                     opponent_index = index_pair[index - 1]
@@ -203,7 +712,11 @@ class Tournament(object):
                            repetition]
                     row.append(str(self.players[player_index]))
                     row.append(str(self.players[opponent_index]))
-                    history = actions_to_str([i[index] for i in interaction])
+                    if isinstance(interaction, Interactions):
+                        history = actions_to_str(interaction.raw[index])
+                    else:
+                        history = actions_to_str(
+                            [i[index] for i in interaction])
                     row.append(history)
 
                     if results is not None:
@@ -212,20 +725,32 @@ class Tournament(object):
                         row.append(turns)
                         row.append(score_per_turns[index])
                         row.append(score_diffs_per_turns[index])
-                        row.append(int(winner_index is index))
-
-                        states = [(A, A), (A, B), (B, A), (B, B)]
-                        if index == 1:
-                            states = [s[::-1] for s in states]
-                        for state in states:
-                            row.append(state_distribution[state])
-
-                    writer.writerow(row)
+                        win = int(winner_index is index)
+                        row.append(win)
+
+                        # The second player sees (A, B) as (B, A)
+                        if index == 0:
+                            counts = state_counts
+                        else:
+                            counts = state_counts[[0, 2, 1, 3]]
+                        row.extend(counts.tolist())
+                        row.extend(state_to_action_counts[index].tolist())
+
+                        self._accumulator.add(
+                            player_index, opponent_index, repetition,
+                            score=scores[index],
+                            score_per_turn=score_per_turns[index],
+                            score_diff_per_turn=score_diffs_per_turns[index],
+                            turns=turns, win=win, state_counts=counts,
+                            state_to_action_counts=state_to_action_counts[index])
+
+                    if writer is not None:
+                        writer.writerow(row)
                 repetition += 1
                 self.num_interactions += 1
 
 
-    def _play_matches(self, chunk, build_results=True):
+    def _play_matches(self, chunk, build_results=True, repetitions=None):
         """
         Play matches in a given chunk.
 
@@ -233,6 +758,9 @@ class Tournament(object):
         ----------
         chunk : tuple (index pair, match_parameters, repetitions)
             match_parameters are also a tuple: (turns, game, noise)
+        repetitions : tuple
+            The first repetition to play and the last one + 1, by default
+            every repetition of the chunk
 
         Returns
         -------
@@ -241,28 +769,125 @@ class Tournament(object):
 
                 (0, 1) -> [(C, D), (D, C),...]
         """
+        index_pair = chunk[0]
+        start, stop = repetitions if repetitions is not None else (0, chunk[2])
+
+        key = self._cache_key(index_pair)
+        match_results = None
+        if key is not None:
+            match_results = self.match_cache.get(key)
+            if match_results is not None:
+                match_results = match_results[start:stop]
+        if match_results is None:
+            match_results = self._play_match_results(chunk, start, stop)
+            # Only complete matches are cached
+            if key is not None and (start, stop) == (0, chunk[2]):
+                self.match_cache.set(key, match_results)
+
+        return self._analyse_match_results(index_pair, match_results,
+                                           build_results)
+
+    def _analyse_match_results(self, index_pair, match_results,
+                               build_results=True):
+        """
+        Calculates the results of the repetitions of a match, if
+        `build_results`.
+
+        Returns
+        -------
+        interactions : dictionary
+            Mapping the index pair to a list of [interactions, results] for
+            each repetition, as returned by `_play_matches`
+        """
         interactions = defaultdict(list)
+        results = None
+        for repetition, result in enumerate(match_results):
+            # Identical repetitions are only analysed once
+            if build_results and (
+                    repetition == 0 or result is not match_results[repetition - 1]):
+                results = self._calculate_results(result)
+            interactions[index_pair].append([result, results])
+        return interactions
+
+    def _play_match_results(self, chunk, start=0, stop=None):
+        """
+        Plays the repetitions of the match in a given chunk, from `start` to
+        `stop` (by default every repetition).
+
+        Returns
+        -------
+        A list with the interactions of each repetition. Repetitions of a
+        match between deterministic players that are played only once (see
+        `Match`) are the same object.
+        """
         index_pair, match_params, repetitions = chunk
+        if stop is None:
+            stop = repetitions
+        if index_pair in self._bulk_actions:
+            actions_1, actions_2 = self._bulk_actions[index_pair]
+            return [actions_to_interactions(*actions)
+                    for actions in zip(actions_1[start:stop],
+                                       actions_2[start:stop])]
+
         p1_index, p2_index = index_pair
         player1 = self.players[p1_index].clone()
         player2 = self.players[p2_index].clone()
         match_params["players"] = (player1, player2)
         match = Match(**match_params)
-        for _ in range(repetitions):
+        if match.fast_forward and match.deterministic:
+            # Every repetition would be identical
             match.play()
+            return [match.result] * (stop - start)
 
-            if build_results:
-                results = self._calculate_results(match.result)
-            else:
-                results = None
-
-            interactions[index_pair].append([match.result, results])
-        return interactions
+        match_results = []
+        for repetition in range(start, stop):
+            if self.seed is not None:
+                match.seed = repetition_seed(self.seed, p1_index, p2_index,
+                                             repetition)
+            match.play()
+            match_results.append(match.result)
+        return match_results
+
+    def _is_cached(self, index_pair):
+        """Whether or not the match between a pair of players is cached."""
+        return (self.match_cache is not None and
+                self._cache_key(index_pair) in self.match_cache)
+
+    def _is_played(self, index_pair):
+        """Whether or not the match between a pair of players is played,
+        rather than read from the match cache or from the matches played in
+        bulk."""
+        return (index_pair not in self._bulk_actions and
+                not self._is_cached(index_pair))
+
+    def _is_bulk(self, index_pair):
+        """Whether or not the match between a pair of players is played in
+        bulk (see `_play_bulk_matches`)."""
+        return all(index in self._bulk_players for index in index_pair)
+
+    def _cache_key(self, index_pair):
+        """Returns the key of the match between a pair of players in the match
+        cache, or None if matches are not cached or it cannot be cached."""
+        if self.match_cache is None:
+            return None
+        fingerprints = [self._fingerprints[index] for index in index_pair]
+        return self.match_cache.key(
+            fingerprints, game=self.game, turns=self.turns,
+            repetitions=self.repetitions,
+            match_attributes=self.match_generator.match_attributes,
+            seed=self.seed, index_pair=index_pair,
+            bulk=self._is_bulk(index_pair))
 
     def _calculate_results(self, interactions):
         results = []
 
-        scores = iu.compute_final_score(interactions, self.game)
+        states = iu.interactions_to_states(interactions)
+        (scores,
+         score_per_turns,
+         state_counts,
+         winner_index,
+         state_to_action_counts) = iu.compute_interaction_summary(states,
+                                                                  self.game)
         results.append(scores)
 
         score_diffs = scores[0] - scores[1], scores[1] - scores[0]
@@ -271,22 +896,41 @@ class Tournament(object):
         turns = len(interactions)
         results.append(turns)
 
-        score_per_turns = iu.compute_final_score_per_turn(interactions,
-                                                          self.game)
         results.append(score_per_turns)
 
         score_diffs_per_turns = score_diffs[0] / turns, score_diffs[1] / turns
         results.append(score_diffs_per_turns)
 
-        state_distribution = iu.compute_state_distribution(interactions)
-        results.append(state_distribution)
+        results.append(state_counts)
+
+        results.append(state_to_action_counts)
 
-        winner_index = iu.compute_winner_index(interactions, self.game)
         results.append(winner_index)
 
         return results
 
 
+class _RemoteTraceback(Exception):
+    """The traceback of an exception raised in a worker process."""
+
+    def __init__(self, formatted_traceback):
+        super().__init__(formatted_traceback)
+        self.formatted_traceback = formatted_traceback
+
+    def __str__(self):
+        return self.formatted_traceback
+
+
+def _picklable(error):
+    """Returns an exception, or a RuntimeError describing it if it cannot be
+    sent between processes."""
+    try:
+        pickle.loads(pickle.dumps(error))
+    except Exception:
+        return RuntimeError("{}: {}".format(type(error).__name__, error))
+    return error
+
+
 def _close_objects(*objs):
     """If the objects have a `close` method, closes them."""
     for obj in objs:
@@ -0,0 +1,111 @@
+"""
+Checks `gamesimulator.AsyncTournament` against a local stub server.
+
+The server answers each request with the reply of Tit For Tat after a random
+delay, so that matches finish out of order. Players asking it for their
+actions are played in an asynchronous tournament and the check fails unless:
+
+* the tournament wrote the same file as a plain Tournament of equivalent
+  synchronous players, so interactions are written in order,
+* more than one match, and never more than `concurrency`, were waiting on
+  the server at the same time. Both players of a match ask at once, so at
+  most twice `concurrency` requests wait together,
+* playing an asynchronous strategy in a plain Match raises a TypeError.
+
+    python run_async_check.py
+"""
+import asyncio
+import filecmp
+import os
+import random
+import sys
+import tempfile
+
+import gamesimulator as gs
+from gamesimulator.action import Action
+from gamesimulator.async_tournament import run
+from gamesimulator.player import Player
+
+concurrency = 4
+waiting = {"now": 0, "most": 0}
+
+
+async def handle(reader, writer):
+    """Replies to a line holding the opponent's history with the next
+    action of Tit For Tat."""
+    line = await reader.readline()
+    waiting["now"] += 1
+    waiting["most"] = max(waiting["most"], waiting["now"])
+    await asyncio.sleep(random.random() / 1000)
+    waiting["now"] -= 1
+    history = line.decode().strip()
+    writer.write((history[-1:] or "A").encode() + b"\n")
+    await writer.drain()
+    writer.close()
+
+
+class RemoteTitForTat(Player):
+    """Asks the stub server for each of its actions."""
+
+    name = "Tit For Tat"
+    port = None  # type: int
+
+    async def strategy(self, opponent):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        history = "".join(str(action) for action in opponent.history)
+        writer.write(history.encode() + b"\n")
+        reply = await reader.readline()
+        writer.close()
+        return Action.from_char(reply.decode().strip())
+
+
+class TitForTat(Player):
+    name = "Tit For Tat"
+
+    def strategy(self, opponent):
+        return opponent.history[-1] if opponent.history else Action.A
+
+
+async def play(filename):
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    RemoteTitForTat.port = server.sockets[0].getsockname()[1]
+    players = [RemoteTitForTat(), gs.Cooperator(), RemoteTitForTat(),
+               gs.Defector(), RemoteTitForTat()]
+    tournament = gs.AsyncTournament(players, turns=10, repetitions=3)
+    try:
+        return await tournament.play_async(filename=filename,
+                                           progress_bar=False,
+                                           concurrency=concurrency)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+directory = tempfile.mkdtemp()
+async_filename = os.path.join(directory, "async.csv")
+plain_filename = os.path.join(directory, "plain.csv")
+
+random.seed(0)
+results = run(play(async_filename))
+players = [TitForTat(), gs.Cooperator(), TitForTat(), gs.Defector(),
+           TitForTat()]
+gs.Tournament(players, turns=10, repetitions=3).play(
+    filename=plain_filename, progress_bar=False)
+
+failures = []
+if not filecmp.cmp(async_filename, plain_filename, shallow=False):
+    failures.append("The interactions differ from those of a Tournament.")
+if not 2 < waiting["most"] <= 2 * concurrency:
+    failures.append("{} requests waited at once, expected 3 to {}.".format(
+        waiting["most"], 2 * concurrency))
+try:
+    gs.Match((RemoteTitForTat(), gs.Cooperator()), turns=2).play()
+    failures.append("A Match played an asynchronous strategy.")
+except TypeError:
+    pass
+
+print("Ranking: {}".format(results.ranked_names))
+print("Most requests waiting at once: {}".format(waiting["most"]))
+for failure in failures:
+    print(failure)
+sys.exit(1 if failures else 0)
@@ -0,0 +1,48 @@
+"""
+Checks that `import gamesimulator` stays fast: the import must not load the
+heavy optional modules and must take less than a budget, in seconds, in a
+fresh interpreter (best of several runs).
+
+Before Python 3.7 modules cannot import names lazily (PEP 562), so the heavy
+modules are imported with the package and the check is skipped.
+
+    python run_import_benchmark.py [budget]
+"""
+import subprocess
+import sys
+
+if sys.version_info < (3, 7):
+    print("Lazy imports need Python 3.7 or later: skipping the import "
+          "benchmark.")
+    sys.exit(0)
+
+budget = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+runs = 5
+heavy_modules = ["matplotlib", "pandas", "dask", "scipy"]
+
+script = """
+import sys, time
+start = time.perf_counter()
+import gamesimulator
+print(time.perf_counter() - start)
+print(",".join(m for m in {} if m in sys.modules))
+""".format(heavy_modules)
+
+timings = []
+for _ in range(runs):
+    output = subprocess.check_output([sys.executable, "-c", script],
+                                     universal_newlines=True).split("\n")
+    timings.append(float(output[0]))
+    loaded = output[1]
+
+best = min(timings)
+print("import gamesimulator: {:.3f}s (budget {:.3f}s)".format(best, budget))
+
+exit_code = 0
+if loaded:
+    print("Heavy modules loaded on import: {}".format(loaded))
+    exit_code = 1
+if best > budget:
+    print("Import time is over budget.")
+    exit_code = 1
+sys.exit(exit_code)